@@ -8,6 +8,20 @@ from .coordinator import HeatPumpCoordinator
 from .const import (
     DOMAIN,
     DATA,
+    CONF_MIN_INTERVAL,
+    CONF_MAX_INTERVAL,
+    CONF_SLOW_INTERVAL,
+    CONF_REQUEST_RATE,
+    CONF_REQUEST_BURST,
+    CONF_STALE_LIMIT,
+    CONF_WRITE_BATCH_SIZE,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_SLOW_INTERVAL,
+    DEFAULT_REQUEST_RATE,
+    DEFAULT_REQUEST_BURST,
+    DEFAULT_STALE_LIMIT,
+    DEFAULT_WRITE_BATCH_SIZE,
 )
 
 # Seznam platforem, které tato integrace podporuje.
@@ -28,10 +42,25 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """
 
     # Vytvoření instance HeatPump s IP adresou získanou z konfiguračního záznamu.
-    hp = HeatPump(hass, entry.data["ip_address"])
+    hp = HeatPump(
+        hass,
+        entry.data["ip_address"],
+        entry.options.get(CONF_SLOW_INTERVAL, DEFAULT_SLOW_INTERVAL),
+        entry.options.get(CONF_REQUEST_RATE, DEFAULT_REQUEST_RATE),
+        entry.options.get(CONF_REQUEST_BURST, DEFAULT_REQUEST_BURST),
+        entry.options.get(CONF_STALE_LIMIT, DEFAULT_STALE_LIMIT),
+    )
+    # Načtení uložených rozložení stránek čerpadla.
+    await hp.async_setup()
     
-    # Vytvoření a inicializace HeatPumpCoordinator.
-    coordinator = HeatPumpCoordinator(hass, hp)
+    # Vytvoření a inicializace HeatPumpCoordinator s limity intervalu z možností.
+    coordinator = HeatPumpCoordinator(
+        hass,
+        hp,
+        entry.options.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL),
+        entry.options.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL),
+        entry.options.get(CONF_WRITE_BATCH_SIZE, DEFAULT_WRITE_BATCH_SIZE),
+    )
 
     # Zajistění, že pro tento doménový klíč existuje slovník v hass.data.
     hass.data.setdefault(DOMAIN, {})
@@ -46,8 +75,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # Nastavení podporovaných platforem pro tento konfigurační záznam.
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    # Po změně možností se integrace znovu načte.
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
     return True
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """
+    Znovu načte konfigurační záznam po změně jeho možností.
+
+    Args:
+        hass: Instance HomeAssistant.
+        entry: Konfigurační záznam, jehož možnosti se změnily.
+    """
+    await hass.config_entries.async_reload(entry.entry_id)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """
     Asynchronní odstranění konfiguračního záznamu pro integraci.
@@ -67,6 +109,10 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     
     # Pokud bylo odstranění úspěšné, odeber data spojená s konfiguračním záznamem.
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)[DATA]
+        # Odeslání zápisů, které ještě čekají ve frontě.
+        await coordinator.writes.async_close()
+        # Uzavření sdíleného spojení s tepelným čerpadlem.
+        await coordinator.hp.async_close()
 
     return unload_ok
@@ -0,0 +1,104 @@
+"""
+Porovnání rychlosti čtení stránek čerpadla: BeautifulSoup vs. extractor.py.
+
+Skript vygeneruje stránky ve stejném tvaru, jaký posílá webový server čerpadla,
+ověří, že obě cesty vrací shodné hodnoty, a změří dobu jednoho zpracování.
+
+Spuštění (vyžaduje beautifulsoup4):
+    python benchmarks/extractor_benchmark.py
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import pathlib
+import random
+import timeit
+
+from bs4 import BeautifulSoup
+
+# extractor.py nezávisí na Home Assistant, načte se přímo ze souboru.
+_SPEC = importlib.util.spec_from_file_location(
+    "extractor", pathlib.Path(__file__).resolve().parent.parent / "extractor.py"
+)
+extractor = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(extractor)
+
+MONITOR_ROWS = 86
+REGULATOR_ROWS = 39
+REPEAT = 200
+
+
+def monitor_page(rows: int = 110) -> bytes:
+    """Vygeneruje stránku index.html s hodnotami v první buňce řádku."""
+    rnd = random.Random(1)
+    lines = ["<html><body><table>", "<tr><th>Hodnota</th><th>Popis</th></tr>"]
+    for row in range(1, rows):
+        lines.append(
+            "<tr><td>%.1f</td><td>Parametr %d</td></tr>" % (rnd.uniform(-20, 60), row)
+        )
+    lines.append("</table></body></html>")
+    return "\n".join(lines).encode()
+
+
+def regulator_page(rows: int = 60) -> bytes:
+    """Vygeneruje stránku edit.html s hodnotami ve vstupních polích."""
+    rnd = random.Random(2)
+    lines = ["<html><body><form><table>", "<tr><th>Hodnota</th><th>Popis</th></tr>"]
+    for row in range(1, rows):
+        lines.append(
+            '<tr><td><input type="text" name="v%d" size="6" value="%.1f"/></td>'
+            "<td>Parametr %d</td></tr>" % (row, rnd.uniform(-20, 60), row)
+        )
+    lines.append("</table></form></body></html>")
+    return "\n".join(lines).encode()
+
+
+def _find_value(text) -> str:
+    """Původní čtení hodnoty vstupního pole z regulátoru."""
+    text = str(text)
+    return text[text.index("value=") + 7 : text.index("/></td>") - 1]
+
+
+def monitor_bs4(body: bytes) -> list[float]:
+    """Původní cesta monitoru přes BeautifulSoup."""
+    rows = BeautifulSoup(body.decode(), "html.parser").find_all("tr")
+    return [float(rows[i].td.string) for i in range(1, MONITOR_ROWS)]
+
+
+def monitor_extractor(body: bytes) -> list[float]:
+    """Nová cesta monitoru přes extractor.py."""
+    rows = extractor.split_rows(body, MONITOR_ROWS - 1)
+    return [float(extractor.cell_text(rows[i])) for i in range(1, MONITOR_ROWS)]
+
+
+def regulator_bs4(body: bytes) -> list[float]:
+    """Původní cesta regulátoru přes BeautifulSoup."""
+    rows = BeautifulSoup(body.decode(), "html.parser").find_all("tr")
+    return [float(_find_value(rows[i].td)) for i in range(1, REGULATOR_ROWS)]
+
+
+def regulator_extractor(body: bytes) -> list[float]:
+    """Nová cesta regulátoru přes extractor.py."""
+    rows = extractor.split_rows(body, REGULATOR_ROWS - 1)
+    return [float(extractor.input_value(rows[i])) for i in range(1, REGULATOR_ROWS)]
+
+
+def main() -> None:
+    """Ověří shodu výsledků a vypíše naměřené časy."""
+    for name, body, old, new in (
+        ("index.html", monitor_page(), monitor_bs4, monitor_extractor),
+        ("edit.html", regulator_page(), regulator_bs4, regulator_extractor),
+    ):
+        assert old(body) == new(body), name
+
+        old_time = timeit.timeit(lambda: old(body), number=REPEAT) / REPEAT
+        new_time = timeit.timeit(lambda: new(body), number=REPEAT) / REPEAT
+        print(
+            "%-10s  BeautifulSoup %8.3f ms   extractor %8.3f ms   %6.1fx"
+            % (name, old_time * 1e3, new_time * 1e3, old_time / new_time)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ from homeassistant.core import (
     callback,
 )
 
+from .coordinator import listener_context, stale_attributes
 from .const import (
     DOMAIN,
     DATA,
@@ -80,6 +81,8 @@ class BinarySensorBase(CoordinatorEntity, BinarySensorEntity):
         super().__init__(coordinator)
         self._device_type = device_type
         self._device = self.coordinator.hp.devices[device_type]
+        # Entita je informována jen o změně dostupnosti a svých klíčů.
+        self.coordinator_context = listener_context(device_type)
 
     @property
     def device_info(self):
@@ -91,6 +94,11 @@ class BinarySensorBase(CoordinatorEntity, BinarySensorEntity):
         """Vrátí dostupnost senzoru."""
         return self._device.get_availability()
 
+    @property
+    def extra_state_attributes(self):
+        """Vrací stáří zobrazených dat, pokud se je nepodařilo obnovit."""
+        return stale_attributes(self.coordinator.hp, self._device.id)
+
     @callback
     def _handle_coordinator_update(self) -> None:
         """Zpracování aktualizace od koordinátora."""
@@ -118,6 +126,8 @@ class RunningBinarySensor(BinarySensorBase):
         super().__init__(coordinator, device_type)
 
         self._id = name.replace(" ", "_").casefold()
+        self.coordinator_context = listener_context(device_type, self._id)
+        self._value = self._device.accessor(self._id)
         self._attr_name = name
         self._attr_unique_id = self._device.id + "_" + self._id
         self.entity_id = "binary_sensor." + self._device.id + "_" + self._id
@@ -132,7 +142,7 @@ class RunningBinarySensor(BinarySensorBase):
         Returns:
             True, pokud je zařízení v provozu, jinak False.
         """
-        return self._device.get_state(self._id)
+        return self._value()
 
     @property
     def icon(self):
@@ -163,6 +173,8 @@ class ProblemBinarySensor(BinarySensorBase):
         super().__init__(coordinator, device_type)
 
         self._id = name.replace(" ", "_").casefold()
+        self.coordinator_context = listener_context(device_type, self._id)
+        self._value = self._device.accessor(self._id)
         self._attr_name = name
         self._attr_unique_id = self._device.id + "_" + self._id
         self.entity_id = "binary_sensor." + self._device.id + "_" + self._id
@@ -177,7 +189,7 @@ class ProblemBinarySensor(BinarySensorBase):
         Returns:
             True, pokud je zařízení v provozu, jinak False.
         """
-        return self._device.get_state(self._id)
+        return self._value()
 
     @property
     def icon(self):
@@ -205,6 +217,8 @@ class GeneralBinarySensor(BinarySensorBase):
         super().__init__(coordinator, device_type)
 
         self._id = name.replace(" ", "_").casefold()
+        self.coordinator_context = listener_context(device_type, self._id)
+        self._value = self._device.accessor(self._id)
         self._attr_name = name
         self._attr_unique_id = self._device.id + "_" + self._id
         self.entity_id = "binary_sensor." + self._device.id + "_" + self._id
@@ -219,7 +233,7 @@ class GeneralBinarySensor(BinarySensorBase):
         Returns:
             True, pokud je zařízení v provozu, jinak False.
         """
-        return self._device.get_state(self._id)
+        return self._value()
 
     @property
     def icon(self):
@@ -0,0 +1,186 @@
+"""
+Ochrana webového serveru čerpadla před opakovanými požadavky při poruše.
+
+RetryBudget omezuje celkový počet opakovaných požadavků, CircuitBreaker
+po několika po sobě jdoucích chybách požadavky na čas zastaví a poté
+pustí jediný zkušební požadavek.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+from .const import (
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+    RETRY_BUDGET,
+    RETRY_BUDGET_WINDOW,
+    BREAKER_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+    BREAKER_MAX_TIMEOUT,
+)
+
+# Stavy jističe.
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpen(Exception):
+    """Jistič je rozpojený, požadavek na čerpadlo se neodeslal."""
+
+
+def retry_delay(
+    attempt: int, base: float = RETRY_BASE_DELAY, maximum: float = RETRY_MAX_DELAY
+) -> float:
+    """
+    Vrátí zpoždění před opakováním požadavku.
+
+    Exponenciální zpoždění s plným náhodným rozptylem, aby se opakování
+    souběžných požadavků nepotkávala.
+
+    Args:
+        attempt: Pořadí opakování od nuly.
+        base: Zpoždění prvního opakování v sekundách.
+        maximum: Nejdelší zpoždění v sekundách.
+    """
+    return random.uniform(0, min(maximum, base * 2**attempt))
+
+
+class RetryBudget:
+    """Omezení počtu opakovaných požadavků v klouzavém okně."""
+
+    def __init__(
+        self, budget: int = RETRY_BUDGET, window: float = RETRY_BUDGET_WINDOW
+    ) -> None:
+        """
+        Inicializace rozpočtu opakování.
+
+        Args:
+            budget: Nejvyšší počet opakování v okně.
+            window: Délka okna v sekundách.
+        """
+        self._budget = budget
+        self._window = window
+        self._spent: list[float] = []
+        # Počet opakování zamítnutých kvůli vyčerpanému rozpočtu.
+        self.denied = 0
+
+    @property
+    def remaining(self) -> int:
+        """Vrátí počet opakování, která jsou v okně ještě k dispozici."""
+        self._expire(time.monotonic())
+        return self._budget - len(self._spent)
+
+    def withdraw(self) -> bool:
+        """
+        Čerpá jedno opakování z rozpočtu.
+
+        Returns:
+            bool: True, pokud je opakování povoleno.
+        """
+        now = time.monotonic()
+        self._expire(now)
+        if len(self._spent) >= self._budget:
+            self.denied += 1
+            return False
+        self._spent.append(now)
+        return True
+
+    def _expire(self, now: float) -> None:
+        """Odstraní opakování starší než okno."""
+        while self._spent and now - self._spent[0] >= self._window:
+            self._spent.pop(0)
+
+
+class CircuitBreaker:
+    """
+    Jistič požadavků na tepelné čerpadlo.
+
+    V sepnutém stavu (closed) požadavky procházejí. Po BREAKER_THRESHOLD po sobě
+    jdoucích chybách se jistič rozpojí (open) a požadavky okamžitě selžou.
+    Po uplynutí doby rozpojení projde jediný zkušební požadavek (half_open):
+    úspěch jistič sepne, chyba ho znovu rozpojí na dvojnásobnou dobu.
+    """
+
+    def __init__(
+        self,
+        threshold: int = BREAKER_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT,
+        max_timeout: float = BREAKER_MAX_TIMEOUT,
+    ) -> None:
+        """
+        Inicializace jističe.
+
+        Args:
+            threshold: Počet po sobě jdoucích chyb, po kterém se jistič rozpojí.
+            reset_timeout: První doba rozpojení v sekundách.
+            max_timeout: Nejdelší doba rozpojení v sekundách.
+        """
+        self._threshold = threshold
+        self._reset_timeout = reset_timeout
+        self._max_timeout = max_timeout
+
+        self.state = CLOSED
+        self.failures = 0
+        self.timeout = reset_timeout
+        self._opened_at = 0.0
+        self._trial = False
+        # Počet rozpojení a počet požadavků zastavených rozpojeným jističem.
+        self.trips = 0
+        self.rejected = 0
+
+    @property
+    def is_open(self) -> bool:
+        """Vrátí True, pokud je jistič rozpojený a nesmí projít ani zkušební požadavek."""
+        return self.state == OPEN and self.retry_in > 0
+
+    @property
+    def retry_in(self) -> float:
+        """Vrátí počet sekund do zkušebního požadavku, 0 mimo stav open."""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.timeout - time.monotonic())
+
+    def check(self) -> None:
+        """
+        Ověří, že požadavek smí projít.
+
+        Raises:
+            CircuitOpen: Pokud je jistič rozpojený nebo už probíhá zkušební požadavek.
+        """
+        if self.state == OPEN and self.retry_in == 0:
+            self.state = HALF_OPEN
+            self._trial = False
+        if self.state == HALF_OPEN and not self._trial:
+            self._trial = True
+            return
+        if self.state != CLOSED:
+            self.rejected += 1
+            raise CircuitOpen(f"Jistic je rozpojeny ({self.state})")
+
+    def release(self) -> None:
+        """Uvolní zkušební požadavek, který se nedokončil."""
+        self._trial = False
+
+    def record_success(self) -> None:
+        """Zaznamená úspěšný požadavek a sepne jistič."""
+        self.state = CLOSED
+        self.failures = 0
+        self.timeout = self._reset_timeout
+        self._trial = False
+
+    def record_failure(self) -> None:
+        """Zaznamená neúspěšný požadavek, případně jistič rozpojí."""
+        self.failures += 1
+        if self.state == OPEN:
+            return
+        if self.state == HALF_OPEN:
+            self.timeout = min(self.timeout * 2, self._max_timeout)
+        elif self.failures < self._threshold:
+            return
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._trial = False
+        self.trips += 1
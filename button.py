@@ -19,6 +19,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+from .coordinator import listener_context
 from .const import (
     DOMAIN,
     DATA,
@@ -82,6 +83,8 @@ class ButtonBase(CoordinatorEntity, ButtonEntity):
         super().__init__(coordinator)
         self._device_type = device_type
         self._device = self.coordinator.hp.devices[device_type]
+        # Entita je informována jen o změně dostupnosti a svých klíčů.
+        self.coordinator_context = listener_context(device_type)
 
     @callback
     def _handle_coordinator_update(self) -> None:
@@ -156,8 +159,8 @@ class UpdateButton(ButtonBase):
         Tato metoda je volána, když uživatel stiskne tlačítko v uživatelském rozhraní.
         """
 
-        _LOGGER.debug("%s : volani Coordinator async_set_updated_data", self.entity_id)
-        await self.coordinator.async_set_updated_data()
+        _LOGGER.debug("%s : volani Coordinator async_manual_refresh", self.entity_id)
+        await self.coordinator.async_manual_refresh()
 
 
 class RestartButton(ButtonBase):
@@ -217,8 +220,5 @@ class RestartButton(ButtonBase):
         """
 
         key = "(0,1,19,0,1)"
-        _LOGGER.debug("%s : volani Heat Pump async_upload_data", self.entity_id)
-        await self._regulator.async_upload_data(key, 1)
-
-        _LOGGER.debug("%s : volani Coordinator async_set_updated_data", self.entity_id)
-        await self.coordinator.async_set_updated_data()
+        _LOGGER.debug("%s : volani Coordinator async_write", self.entity_id)
+        await self.coordinator.async_write(key, 1)
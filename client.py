@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.auth import HTTPBasicAuth
+from urllib3.exceptions import NewConnectionError
+
+from .const import (
+    INDEX_PAGE,
+    EDIT_PAGE,
+    REQUEST_CONNECT_TIMEOUT,
+    REQUEST_READ_TIMEOUT,
+)
+
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+# Přihlašovací údaje webového rozhraní čerpadla jsou pevně dané výrobcem.
+USERNAME = "mastertherm"
+PASSWORD = "fmastertherm"
+
+HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
+    "Accept-Language": "cs-CZ,cs;q=0.9",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+}
+
+
+def request_not_sent(error: Exception) -> bool:
+    """
+    Zjistí, zda se požadavek k čerpadlu určitě nedostal.
+
+    Platí jen pro chyby navazování spojení (vypršení limitu spojení, odmítnuté
+    spojení). Přerušené spojení nebo chyba čtení odpovědi mohou nastat až
+    po odeslání požadavku.
+
+    Args:
+        error: Chyba požadavku.
+    """
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.ConnectionError) or not error.args:
+        return False
+    return isinstance(getattr(error.args[0], "reason", None), NewConnectionError)
+
+
+def request_retryable(error: Exception) -> bool:
+    """
+    Zjistí, zda má smysl požadavek na čtení opakovat.
+
+    Chyby klienta (HTTP 4xx) se opakováním nezmění, ostatní chyby mohou být
+    přechodné.
+
+    Args:
+        error: Chyba požadavku.
+    """
+    if not isinstance(error, requests.HTTPError) or error.response is None:
+        return True
+    return not 400 <= error.response.status_code < 500
+
+
+class MasterThermClient:
+    """
+    HTTP klient webového rozhraní tepelného čerpadla MasterTherm.
+
+    Drží jedno trvalé spojení (requests.Session) se společnými hlavičkami
+    a autentizací, které sdílí monitor, regulátor i zápisy hodnot. Metody
+    jsou blokující a volají se v exekutoru, každý požadavek má časový limit
+    spojení i čtení, takže nezablokuje vlákno exekutoru natrvalo.
+    """
+
+    def __init__(self, ip_address: str) -> None:
+        """
+        Inicializace klienta.
+
+        Args:
+            ip_address: IP adresa tepelného čerpadla.
+        """
+        self._base_url = "http://" + ip_address
+        self._session = None
+
+    @property
+    def session(self) -> requests.Session:
+        """Vrátí sdílenou session, při prvním použití ji vytvoří."""
+        if self._session is None:
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            session.auth = HTTPBasicAuth(USERNAME, PASSWORD)
+            session.verify = False
+            # Čerpadlo obsluhuje jen několik spojení, více jich držet nemá smysl.
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2)
+            session.mount("http://", adapter)
+            self._session = session
+        return self._session
+
+    def fetch(self, page: str) -> requests.Response:
+        """
+        Načte stránku webového rozhraní čerpadla.
+
+        Args:
+            page: Cesta ke stránce, např. INDEX_PAGE.
+
+        Returns:
+            Odpověď čerpadla.
+
+        Raises:
+            requests.RequestException: Chyba spojení, vypršení limitu nebo
+                chybový stavový kód odpovědi.
+        """
+        response = self.session.get(
+            self._base_url + page,
+            headers={"Referer": self._base_url + INDEX_PAGE},
+            timeout=(REQUEST_CONNECT_TIMEOUT, REQUEST_READ_TIMEOUT),
+        )
+        response.raise_for_status()
+        return response
+
+    def upload(self, values: dict) -> requests.Response:
+        """
+        Zapíše hodnoty parametrů přes rozhraní `script:var` stránky edit.html.
+
+        Všechny parametry se odešlou v jednom požadavku, každý jako samostatný
+        parametr dotazu.
+
+        Args:
+            values: Hodnoty podle klíče parametru, např. {"(0,2,83,-20,30)": 5.0}.
+
+        Returns:
+            Odpověď čerpadla.
+
+        Raises:
+            requests.RequestException: Chyba spojení, vypršení limitu nebo
+                chybový stavový kód odpovědi.
+        """
+        response = self.session.get(
+            self._base_url + EDIT_PAGE,
+            params={"?script:var" + key: str(value) for key, value in values.items()},
+            headers={"Referer": self._base_url + EDIT_PAGE + "?"},
+            timeout=(REQUEST_CONNECT_TIMEOUT, REQUEST_READ_TIMEOUT),
+        )
+        response.raise_for_status()
+        return response
+
+    def close(self) -> None:
+        """Uzavře session a všechna otevřená spojení."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
@@ -7,9 +7,25 @@ import voluptuous as vol
 import ipaddress
 
 from homeassistant import config_entries, exceptions
-from homeassistant.core import HomeAssistant
-
-from .const import DOMAIN
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    DOMAIN,
+    CONF_MIN_INTERVAL,
+    CONF_MAX_INTERVAL,
+    CONF_SLOW_INTERVAL,
+    CONF_REQUEST_RATE,
+    CONF_REQUEST_BURST,
+    CONF_STALE_LIMIT,
+    CONF_WRITE_BATCH_SIZE,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_SLOW_INTERVAL,
+    DEFAULT_REQUEST_RATE,
+    DEFAULT_REQUEST_BURST,
+    DEFAULT_STALE_LIMIT,
+    DEFAULT_WRITE_BATCH_SIZE,
+)
 from .heat_pump import HeatPump
 
 _LOGGER = logging.getLogger(__name__)
@@ -52,6 +68,12 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
     CONNECTION_CLASS = config_entries.CONN_CLASS_LOCAL_PUSH
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Vrátí tok možností integrace."""
+        return OptionsFlow(config_entry)
+
     async def async_step_user(self, user_input=None):
         """Zpracuje úvodní krok."""
         errors = {}
@@ -74,6 +96,68 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
 
+class OptionsFlow(config_entries.OptionsFlow):
+    """Zpracování možností MasterTherm: intervaly a rychlost dotazování."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Inicializuje tok možností."""
+        self.config_entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        """
+        Zpracuje nastavení intervalů dotazování.
+
+        Nejkratší a nejdelší interval omezují dotazování monitoru, pomalý
+        interval určuje, jak často se načítá nastavení regulátoru. Rychlost
+        a nárazový počet požadavků chrání webový server čerpadla. Limit stáří
+        určuje, jak dlouho se po chybě zobrazují poslední načtená data.
+        Více parametrů v jednom požadavku zápisu je nutné povolit výslovně.
+        """
+        errors = {}
+        if user_input is not None:
+            if user_input[CONF_MAX_INTERVAL] < user_input[CONF_MIN_INTERVAL]:
+                errors["base"] = "invalid_interval"
+            else:
+                return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_MIN_INTERVAL,
+                    default=options.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+                vol.Required(
+                    CONF_MAX_INTERVAL,
+                    default=options.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+                vol.Required(
+                    CONF_SLOW_INTERVAL,
+                    default=options.get(CONF_SLOW_INTERVAL, DEFAULT_SLOW_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=60, max=86400)),
+                vol.Required(
+                    CONF_REQUEST_RATE,
+                    default=options.get(CONF_REQUEST_RATE, DEFAULT_REQUEST_RATE),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=10)),
+                vol.Required(
+                    CONF_REQUEST_BURST,
+                    default=options.get(CONF_REQUEST_BURST, DEFAULT_REQUEST_BURST),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=20)),
+                vol.Required(
+                    CONF_STALE_LIMIT,
+                    default=options.get(CONF_STALE_LIMIT, DEFAULT_STALE_LIMIT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=86400)),
+                vol.Required(
+                    CONF_WRITE_BATCH_SIZE,
+                    default=options.get(
+                        CONF_WRITE_BATCH_SIZE, DEFAULT_WRITE_BATCH_SIZE
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=8)),
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
+
+
 class CannotConnect(exceptions.HomeAssistantError):
     """Chyba indikující, že nelze navázat spojení."""
 
@@ -6,3 +6,93 @@ DOMAIN = "mastertherm"
 DATA = "data"
 MONITOR = "monitor"
 REGULATOR = "regulator"
+
+# Ověření dostupnosti webového serveru tepelného čerpadla.
+PROBE_PORT = 80
+PROBE_TIMEOUT = 3.0
+PROBE_TTL = 30
+PROBE_MAX_BACKOFF = 300
+
+# Webové rozhraní tepelného čerpadla.
+INDEX_PAGE = "/http/index.html"
+EDIT_PAGE = "/http/edit.html"
+
+# Maximální počet souběžných požadavků na webový server čerpadla.
+MAX_PARALLEL_REQUESTS = 2
+
+# Pseudoklíč změny dostupnosti zařízení ve sledování změn.
+AVAILABILITY = None
+
+# Pásmo necitlivosti teplotních senzorů: nový stav se zapíše až při změně
+# o více než TEMPERATURE_DEADBAND °C, nebo po uplynutí DEADBAND_MAX_INTERVAL sekund.
+TEMPERATURE_DEADBAND = 0.1
+DEADBAND_MAX_INTERVAL = 900
+
+# Sdružování zápisů parametrů: zápisy během WRITE_BATCH_WINDOW sekund se odešlou
+# společně, nejvýše CONF_WRITE_BATCH_SIZE parametrů v jednom požadavku script:var.
+# Že regulátor přijme více parametrů v jednom požadavku, není ověřeno na všech
+# verzích firmware, proto se ve výchozím nastavení posílá jeden parametr.
+WRITE_BATCH_WINDOW = 0.5
+CONF_WRITE_BATCH_SIZE = "write_batch_size"
+DEFAULT_WRITE_BATCH_SIZE = 1
+
+# Po zápisu se hodnoty hned promítnou do dat zařízení (optimistický zápis)
+# a za WRITE_CONFIRM_DELAY sekund je potvrdí nové čtení stránek.
+OPTIMISTIC_WRITES = True
+WRITE_CONFIRM_DELAY = 3
+
+# Nejkratší interval mezi ručními aktualizacemi dat v sekundách.
+MIN_MANUAL_REFRESH_INTERVAL = 10
+
+# Adaptivní interval dotazování v sekundách. Mezi CONF_MIN_INTERVAL
+# a CONF_MAX_INTERVAL z možností integrace se interval při stabilních hodnotách
+# prodlužuje POLL_BACKOFF krát, při změně stavu se vrací na minimum.
+CONF_MIN_INTERVAL = "min_interval"
+CONF_MAX_INTERVAL = "max_interval"
+DEFAULT_MIN_INTERVAL = 20
+DEFAULT_MAX_INTERVAL = 300
+POLL_BACKOFF = 1.5
+# Rychlost změny teploty (°C/min), od které se dotazuje s nejkratším intervalem.
+POLL_TEMPERATURE_RATE = 0.5
+# Pseudoklíč monitoru pro diagnostický senzor intervalu dotazování.
+POLL_INTERVAL_KEY = "interval_dotazovani"
+
+# Úrovně dotazování: stránka regulátoru (nastavení) se při pravidelné
+# aktualizaci načítá jen jednou za CONF_SLOW_INTERVAL sekund, po chybě nebo po zápisu.
+CONF_SLOW_INTERVAL = "slow_interval"
+DEFAULT_SLOW_INTERVAL = 900
+
+# Časové limity HTTP požadavků na čerpadlo v sekundách (spojení, čtení).
+REQUEST_CONNECT_TIMEOUT = 3.05
+REQUEST_READ_TIMEOUT = 10
+# Opakování neúspěšného požadavku: nejvýše RETRY_ATTEMPTS opakování s exponenciálním
+# zpožděním od RETRY_BASE_DELAY do RETRY_MAX_DELAY sekund (s náhodným rozptylem)
+# a celkem nejvýše RETRY_BUDGET opakování za RETRY_BUDGET_WINDOW sekund.
+RETRY_ATTEMPTS = 2
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 5.0
+RETRY_BUDGET = 6
+RETRY_BUDGET_WINDOW = 60
+# Jistič: po BREAKER_THRESHOLD po sobě jdoucích chybách se požadavky na čerpadlo
+# na BREAKER_RESET_TIMEOUT sekund zastaví (při opakovaném selhání až na
+# BREAKER_MAX_TIMEOUT), poté se zkusí jediný zkušební požadavek.
+BREAKER_THRESHOLD = 3
+BREAKER_RESET_TIMEOUT = 30
+BREAKER_MAX_TIMEOUT = 600
+
+# Omezení rychlosti požadavků na webový server čerpadla (token bucket):
+# průměrně CONF_REQUEST_RATE požadavků za sekundu, nárazově až CONF_REQUEST_BURST.
+CONF_REQUEST_RATE = "request_rate"
+CONF_REQUEST_BURST = "request_burst"
+DEFAULT_REQUEST_RATE = 1.0
+DEFAULT_REQUEST_BURST = 4
+# Priority požadavků, menší číslo má přednost.
+PRIORITY_WRITE = 0
+PRIORITY_READ = 1
+
+# Po neúspěšném obnovení dat zobrazují entity poslední dobrá data
+# s atributem ATTR_DATA_AGE, nedostupné jsou až po CONF_STALE_LIMIT sekundách.
+# Hodnota 0 zobrazování starých dat vypne.
+CONF_STALE_LIMIT = "stale_limit"
+DEFAULT_STALE_LIMIT = 600
+ATTR_DATA_AGE = "stari_dat"
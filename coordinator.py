@@ -1,14 +1,268 @@
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
 
 from datetime import timedelta
+import asyncio
 import logging
+import time
 
 _LOGGER = logging.getLogger(__name__)
 
 from .heat_pump import HeatPump
+from .polling import AdaptivePolling
+from .const import (
+    AVAILABILITY,
+    ATTR_DATA_AGE,
+    MONITOR,
+    REGULATOR,
+    WRITE_BATCH_WINDOW,
+    DEFAULT_WRITE_BATCH_SIZE,
+    OPTIMISTIC_WRITES,
+    WRITE_CONFIRM_DELAY,
+    MIN_MANUAL_REFRESH_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_MAX_INTERVAL,
+    POLL_INTERVAL_KEY,
+)
+
+
+def listener_context(device_type: str, *keys: str) -> frozenset:
+    """
+    Vrátí kontext posluchače pro klíče zařízení, které entita zobrazuje.
+
+    Kontext vždy obsahuje i změnu dostupnosti zařízení.
+
+    Args:
+        device_type: Typ zařízení (MONITOR, REGULATOR).
+        *keys: Klíče atributů zařízení.
+    """
+    return frozenset((device_type, key) for key in (AVAILABILITY, *keys))
+
+
+def stale_attributes(hp: HeatPump, *device_types: str) -> dict | None:
+    """
+    Vrátí atributy entity se stářím dat, pokud se data nepodařilo obnovit.
+
+    U entity, která zobrazuje data více zařízení, se uvádí nejstarší z nich.
+
+    Args:
+        hp: Tepelné čerpadlo.
+        *device_types: Typy zařízení (MONITOR, REGULATOR), jejichž data
+            entita zobrazuje.
+
+    Returns:
+        dict | None: Atribut ATTR_DATA_AGE se stářím v sekundách, None pro
+            aktuální data.
+    """
+    ages = [age for age in map(hp.stale_age, device_types) if age is not None]
+    if not ages:
+        return None
+    return {ATTR_DATA_AGE: round(max(ages))}
+
+
+class WriteQueue:
+    """
+    Fronta zápisů parametrů regulátoru.
+
+    Zápisy se sbírají po dobu okna WRITE_BATCH_WINDOW od prvního zápisu.
+    Pro každý klíč se odešle jen poslední hodnota, parametry se posílají
+    po nejvýše batch_size v jednom požadavku script:var. I při více
+    požadavcích následuje po dávce jediné čtení dat.
+
+    Při optimistickém zápisu se odeslané hodnoty hned promítnou do dat
+    zařízení a za WRITE_CONFIRM_DELAY sekund je potvrdí jediné čtení stránek.
+    Hodnotu, kterou čerpadlo nepřijalo, potvrzovací čtení vrátí zpět.
+    Jinak po odeslání následuje jediná aktualizace dat pro celou dávku.
+    Čtou se jen stránky zařízení, jejichž data zápis zneplatnil.
+    """
+
+    def __init__(
+        self,
+        coordinator: "HeatPumpCoordinator",
+        window: float = WRITE_BATCH_WINDOW,
+        batch_size: int = DEFAULT_WRITE_BATCH_SIZE,
+        optimistic: bool = OPTIMISTIC_WRITES,
+        confirm_delay: float = WRITE_CONFIRM_DELAY,
+    ) -> None:
+        """
+        Inicializace fronty zápisů.
+
+        Args:
+            coordinator: Koordinátor, jehož data se po zápisu aktualizují.
+            window: Doba sběru zápisů v sekundách.
+            batch_size: Nejvyšší počet parametrů v jednom požadavku.
+            optimistic: Promítne zapsané hodnoty hned, bez čekání na čtení.
+            confirm_delay: Zpoždění potvrzovacího čtení v sekundách.
+        """
+        self._coordinator = coordinator
+        self._window = window
+        self._batch_size = batch_size
+        self._pending: dict = {}
+        self._waiters: list[asyncio.Future] = []
+        self._unsub_flush = None
+        self._optimistic = optimistic
+        self._confirm_delay = confirm_delay
+        self._unconfirmed: dict = {}
+        self._unsub_confirm = None
+        self._lock = asyncio.Lock()
+        # Počet zápisů přijatých frontou, skutečně odeslaných požadavků
+        # a parametrů, které čerpadlo podle potvrzovacího čtení nepřijalo.
+        self.queued_writes = 0
+        self.sent_requests = 0
+        self.rejected_writes = 0
+
+    async def async_write(self, key: str, value) -> None:
+        """
+        Zařadí zápis parametru a počká na jeho odeslání a promítnutí do dat.
+
+        Args:
+            key: Klíč parametru, např. "(0,2,83,-20,30)".
+            value: Hodnota, která se má pro daný klíč nastavit.
+
+        Raises:
+            Exception: Chyba odeslání dávky nebo následné aktualizace.
+        """
+        await self.async_write_values({key: value})
+
+    async def async_write_values(self, values: dict) -> None:
+        """
+        Zařadí zápis několika parametrů jako jednu transakci.
+
+        Parametry se odešlou ve stejné dávce v daném pořadí a následuje
+        jediné čtení dat pro celou dávku.
+
+        Args:
+            values: Hodnoty parametrů podle klíče.
+
+        Raises:
+            Exception: Chyba odeslání dávky nebo následné aktualizace.
+        """
+        if not values:
+            return
+        for key, value in values.items():
+            # Opakovaný zápis klíče přepíše dřívější hodnotu a posune klíč na konec.
+            self._pending.pop(key, None)
+            self._pending[key] = value
+        self.queued_writes += len(values)
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self._coordinator.hass, self._window, self._async_flush_later
+            )
+        await future
+
+    async def _async_flush_later(self, _now) -> None:
+        """Odešle dávku po uplynutí okna."""
+        self._unsub_flush = None
+        await self.async_flush()
+
+    async def async_flush(self) -> None:
+        """
+        Okamžitě odešle všechny čekající zápisy a promítne je do dat.
+
+        Chyba se předá všem, kdo na zápisy z dávky čekají. Pokud odeslání
+        selže, zařízení dotčená již odeslanými dávkami se přesto načtou znovu.
+        """
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        values, self._pending = self._pending, {}
+        waiters, self._waiters = self._waiters, []
+        if not values:
+            return
+
+        sent = {}
+        try:
+            async with self._lock:
+                try:
+                    await self._async_send(values, sent)
+                finally:
+                    # Dávky odeslané před chybou mohlo čerpadlo přijmout.
+                    self._coordinator.hp.mark_stale(sent)
+                    if len(sent) < len(values):
+                        try:
+                            await self._coordinator.async_refresh_stale()
+                        except Exception as e:
+                            _LOGGER.warning(
+                                "nacteni dat po chybe zapisu selhalo: %s", e
+                            )
+                if self._optimistic:
+                    self._coordinator.async_apply_written(values)
+                    self._schedule_confirmation(values)
+                else:
+                    await self._coordinator.async_refresh_stale()
+        except Exception as e:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(e)
+        else:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    async def _async_send(self, values: dict, sent: dict) -> None:
+        """
+        Odešle hodnoty po dávkách nejvýše batch_size parametrů.
+
+        Args:
+            values: Hodnoty parametrů podle klíče.
+            sent: Doplní se o hodnoty úspěšně odeslaných dávek.
+        """
+        regulator = self._coordinator.hp.devices[REGULATOR]
+        items = list(values.items())
+        for start in range(0, len(items), self._batch_size):
+            batch = dict(items[start : start + self._batch_size])
+            _LOGGER.debug("volani Regulator async_upload_data %s", list(batch))
+            await regulator.async_upload_data(batch)
+            sent.update(batch)
+            self.sent_requests += 1
+
+    def _schedule_confirmation(self, values: dict) -> None:
+        """Naplánuje potvrzovací čtení, další zápisy ho odsunou a připojí se."""
+        self._unconfirmed.update(values)
+        if self._unsub_confirm is not None:
+            self._unsub_confirm()
+        self._unsub_confirm = async_call_later(
+            self._coordinator.hass, self._confirm_delay, self._async_confirm
+        )
+
+    async def _async_confirm(self, _now) -> None:
+        """
+        Načte data čerpadla a ověří, že čerpadlo zapsané hodnoty přijalo.
+
+        Nepřijaté hodnoty nahradí v datech zařízení hodnoty přečtené z čerpadla.
+        """
+        self._unsub_confirm = None
+        values, self._unconfirmed = self._unconfirmed, {}
+        try:
+            async with self._lock:
+                await self._coordinator.async_refresh_stale()
+        except Exception as e:
+            # Zařízení zůstanou neaktuální a hodnoty opraví příští pravidelné
+            # načtení, otisk obsahu je vymazán.
+            _LOGGER.warning("potvrzeni zapisu %s selhalo: %s", list(values), e)
+            self._coordinator.hp.mark_stale(values)
+            return
+
+        rejected = self._coordinator.hp.unconfirmed_writes(values)
+        if rejected:
+            self.rejected_writes += len(rejected)
+            _LOGGER.warning(
+                "cerpadlo neprijalo zapis %s, hodnoty vraceny", sorted(rejected)
+            )
+
+    async def async_close(self) -> None:
+        """Odešle čekající zápisy a zruší naplánované potvrzovací čtení."""
+        await self.async_flush()
+        if self._unsub_confirm is not None:
+            self._unsub_confirm()
+            self._unsub_confirm = None
 
 
 class HeatPumpCoordinator(DataUpdateCoordinator):
@@ -17,46 +271,297 @@ class HeatPumpCoordinator(DataUpdateCoordinator):
     
     Tato třída rozšiřuje DataUpdateCoordinator a zajišťuje pravidelné aktualizace dat
     z tepelného čerpadla. Používá async metody tepelného čerpadla pro získání a aktualizaci dat.
+
+    Daty koordinátoru je otisk obsahu stránek čerpadla. Pokud se otisk nezmění,
+    posluchači (entity) nejsou o aktualizaci informováni. Jinak jsou informováni
+    jen ti posluchači, jejichž kontext (viz listener_context) obsahuje změněný klíč.
+
+    Současně probíhá nejvýše jedno načtení stejných stránek. Kdo o načtení
+    požádá během probíhajícího načtení, počká na jeho výsledek.
+
+    Interval pravidelné aktualizace se po každém načtení přizpůsobí provoznímu
+    stavu čerpadla, viz AdaptivePolling. Pravidelná aktualizace načítá jen
+    zařízení, jejichž úroveň dotazování to vyžaduje, viz HeatPump.due_devices.
     """
 
-    def __init__(self, hass, hp: HeatPump, update_interval=timedelta(minutes=2)):
-        """Inicializuje HeatPumpCoordinator."""
+    def __init__(
+        self,
+        hass,
+        hp: HeatPump,
+        min_interval=DEFAULT_MIN_INTERVAL,
+        max_interval=DEFAULT_MAX_INTERVAL,
+        write_batch_size=DEFAULT_WRITE_BATCH_SIZE,
+    ):
+        """
+        Inicializuje HeatPumpCoordinator.
+
+        Args:
+            hass: Instance HomeAssistant.
+            hp: Tepelné čerpadlo.
+            min_interval: Nejkratší interval pravidelné aktualizace v sekundách.
+            max_interval: Nejdelší interval pravidelné aktualizace v sekundách.
+            write_batch_size: Nejvyšší počet parametrů v jednom požadavku zápisu.
+        """
+        self.polling = AdaptivePolling(min_interval, max_interval)
+        update_interval = timedelta(seconds=self.polling.interval)
 
         super().__init__(
             hass,
             logger=_LOGGER,
             name="HeatPumpCoordinator",
             update_interval=update_interval,
+            always_update=False,
         )
         self.hass = hass
         self.hp = hp
+        # Počet aktualizací, při kterých se data nezměnila a entity se neinformovaly.
+        self.skipped_updates = 0
+        self._notified_success = True
+        self.writes = WriteQueue(self, batch_size=write_batch_size)
+        # Probíhající načtení dat a zařízení, která načítá (None pro všechna).
+        self._fetch_task = None
+        self._fetch_devices = None
+        # Čas poslední ruční aktualizace.
+        self._last_manual_refresh = None
+        # Počet načtení, která se připojila k probíhajícímu načtení,
+        # a počet ručních aktualizací vynechaných kvůli minimálnímu intervalu.
+        self.deduplicated_refreshes = 0
+        self.throttled_refreshes = 0
+
+    async def _async_fetch(self, devices=None) -> dict:
+        """
+        Načte data čerpadla, nejvýše jedno načtení stejných stránek současně.
+
+        Pokud probíhá načtení, které zahrnuje požadovaná zařízení, počká se
+        na jeho výsledek a nový požadavek se do čerpadla neposílá. Pokud
+        zahrnuje jen část zařízení, počká se na něj a načtou se jen zbývající.
+
+        Args:
+            devices: Identifikátory zařízení, která se mají načíst, None pro všechna.
+
+        Returns:
+            dict: Chyby jednotlivých zařízení podle jejich identifikátoru.
+        """
+        devices = None if devices is None else frozenset(devices)
+        task = self._fetch_task
+        if (
+            task is not None
+            and not task.done()
+            and (
+                self._fetch_devices is None
+                or (devices is not None and devices <= self._fetch_devices)
+            )
+        ):
+            _LOGGER.debug("%s : pripojeni k probihajicimu nacteni", self.name)
+            self.deduplicated_refreshes += 1
+            return await asyncio.shield(task)
+
+        if task is not None and not task.done():
+            return await self._async_fetch_remaining(task, devices)
+
+        task = self.hass.async_create_task(self.hp.async_fetch_all_data(devices))
+        self._fetch_task = task
+        self._fetch_devices = devices
+        return await asyncio.shield(task)
+
+    async def _async_fetch_remaining(self, task, devices) -> dict:
+        """
+        Počká na probíhající načtení části zařízení a načte zbývající zařízení.
+
+        Args:
+            task: Probíhající načtení.
+            devices: Požadovaná zařízení, None pro všechna.
+
+        Returns:
+            dict: Chyby požadovaných zařízení podle jejich identifikátoru.
+
+        Raises:
+            Exception: Pokud se nepodařilo načíst data žádného požadovaného zařízení.
+        """
+        running = self._fetch_devices
+        wanted = frozenset(self.hp.devices) if devices is None else devices
+        _LOGGER.debug(
+            "%s : pripojeni k probihajicimu nacteni %s", self.name, list(running)
+        )
+        self.deduplicated_refreshes += 1
+        try:
+            errors = dict(await asyncio.shield(task))
+        except Exception as e:
+            errors = dict.fromkeys(running, e)
+
+        remaining = wanted - running
+        try:
+            errors.update(await self._async_fetch(remaining))
+        except Exception as e:
+            errors.update(dict.fromkeys(remaining, e))
+
+        errors = {
+            device_id: e for device_id, e in errors.items() if device_id in wanted
+        }
+        if len(errors) == len(wanted):
+            raise next(iter(errors.values()))
+        return errors
+
+    async def async_write(self, key: str, value) -> None:
+        """
+        Zapíše parametr regulátoru přes frontu zápisů.
+
+        Zápisy z krátkého okna se odešlou společně a jejich hodnoty se hned
+        promítnou do dat, viz WriteQueue.
+
+        Args:
+            key: Klíč parametru, např. "(0,2,83,-20,30)".
+            value: Hodnota, která se má pro daný klíč nastavit.
+        """
+        await self.writes.async_write(key, value)
+
+    async def async_write_values(self, values: dict) -> None:
+        """
+        Zapíše několik parametrů regulátoru jako jednu transakci.
+
+        Args:
+            values: Hodnoty parametrů podle klíče.
+        """
+        await self.writes.async_write_values(values)
+
+    async def async_manual_refresh(self) -> None:
+        """
+        Aktualizuje data na žádost uživatele.
+
+        Aktualizace se vynechá, pokud od poslední ruční aktualizace uplynulo
+        méně než MIN_MANUAL_REFRESH_INTERVAL sekund. Pravidelné a potvrzovací
+        čtení ruční aktualizaci neomezují.
+        """
+        now = time.monotonic()
+        if (
+            self._last_manual_refresh is not None
+            and now - self._last_manual_refresh < MIN_MANUAL_REFRESH_INTERVAL
+        ):
+            _LOGGER.debug("%s : data jsou aktualni, nacteni vynechano", self.name)
+            self.throttled_refreshes += 1
+            return
+        self._last_manual_refresh = now
+        await self.async_set_updated_data()
+
+    async def async_refresh_stale(self) -> None:
+        """Znovu načte jen data zařízení, která zneplatnil zápis parametrů."""
+        await self.async_set_updated_data(set(self.hp.stale_devices))
+
+    @callback
+    def async_apply_written(self, values: dict) -> None:
+        """
+        Promítne zapsané hodnoty do dat zařízení a informuje dotčené entity.
+
+        Otisk obsahu změněných zařízení se vymaže, takže potvrzovací čtení
+        informuje entity i tehdy, když se stránka čerpadla nezměnila.
+
+        Args:
+            values: Zapsané hodnoty podle klíče parametru.
+        """
+        self.hp.apply_written(values)
+        self.data = self.hp.content_fingerprint
+        self.async_update_listeners()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """
+        Informuje posluchače, jejichž klíče se od minulého informování změnily.
+
+        Posluchači bez kontextu jsou informováni vždy, při změně úspěšnosti
+        aktualizace jsou informováni všichni posluchači.
+        """
+        changes = self.hp.pop_changes()
+        notify_all = self.last_update_success != self._notified_success
+        self._notified_success = self.last_update_success
+
+        for update_callback, context in list(self._listeners.values()):
+            if notify_all or context is None or not context.isdisjoint(changes):
+                update_callback()
 
     async def _async_update_data(self):
         """
         Asynchronně aktualizuje data tepelného čerpadla.
         
         Získává dostupnost tepelného čerpadla a pokud je dostupné, pokusí se získat všechna data.
-        Pokud dojde k chybě, vyvolá výjimku UpdateFailed.
+        Pokud se data nepodaří obnovit, entity dál zobrazují poslední dobrá data
+        s jejich stářím. Výjimku UpdateFailed vyvolá, až když žádné zařízení
+        nemá aktuální data ani data v limitu stáří.
+
+        Returns:
+            Otisk obsahu stránek čerpadla, None pokud čerpadlo není dostupné.
         """
         _LOGGER.debug("%s : volani Heat Pump async_get_availability", self.name)
         if await self.hp.async_get_availability():
             _LOGGER.debug("%s : Heat Pump je dostupny", self.name)
             try:
                 _LOGGER.debug("%s : volani Heat Pump async_fetch_all_data", self.name)
-                await self.hp.async_fetch_all_data()
+                errors = await self._async_fetch(self.hp.due_devices())
 
             except Exception as e:
                 _LOGGER.debug(
                     "volani Heat Pump async_fetch_all_data probehlo NEuspesne"
                 )
-                raise UpdateFailed(f"Chyba při aktualizaci dat: {e}")
+                # Dostupné je zařízení s aktuálními daty nebo s daty v limitu stáří.
+                devices = self.hp.devices.values()
+                if not any(device.get_availability() for device in devices):
+                    raise UpdateFailed(f"Chyba při aktualizaci dat: {e}")
+                _LOGGER.debug("%s : zobrazuji se posledni nactena data", self.name)
+            else:
+                if errors:
+                    _LOGGER.debug(
+                        "%s : data zarizeni %s nebyla nactena", self.name, list(errors)
+                    )
+
+            fingerprint = self.hp.content_fingerprint
+            interval_changed = self._adapt_interval()
+            stale = self.hp.mark_stale_ages()
+            if fingerprint == self.data:
+                # Při always_update=False DataUpdateCoordinator posluchače neinformuje.
+                _LOGGER.debug("%s : data cerpadla se nezmenila", self.name)
+                self.skipped_updates += 1
+                if interval_changed or stale:
+                    self.async_update_listeners()
+            return fingerprint
+
+        # Entity zobrazující stará data zapíší jejich nové stáří.
+        if self.hp.mark_stale_ages() and self.data is None:
+            self.async_update_listeners()
+        return None
+
+    def _adapt_interval(self) -> bool:
+        """
+        Přizpůsobí interval pravidelné aktualizace nově načteným datům.
+
+        Změnu intervalu nebo jeho důvodu zaznamená pod pseudoklíčem
+        POLL_INTERVAL_KEY monitoru pro diagnostický senzor.
+
+        Returns:
+            bool: True, pokud se interval nebo jeho důvod změnil.
+        """
+        previous = (self.polling.interval, self.polling.reason)
+        interval = self.polling.update(self.hp.devices[MONITOR])
+        self.update_interval = timedelta(seconds=interval)
+        if (interval, self.polling.reason) == previous:
+            return False
+        _LOGGER.debug(
+            "%s : interval dotazovani %.0f s (%s)",
+            self.name,
+            interval,
+            self.polling.reason,
+        )
+        self.hp.mark_changed(MONITOR, (POLL_INTERVAL_KEY,))
+        return True
 
-    async def async_set_updated_data(self):
+    async def async_set_updated_data(self, devices=None):
         """
         Nastaví aktualizovaná data pro tepelné čerpadlo.
         
         Zruší aktuálně naplánovanou aktualizaci, provede aktualizaci dat a pokud má posluchače,
-        naplánuje novou aktualizaci. Informuje posluchače o aktualizaci.
+        naplánuje novou aktualizaci, i když aktualizace selhala. Informuje posluchače
+        o aktualizaci, pokud se data změnila.
+
+        Args:
+            devices: Identifikátory zařízení, která se mají načíst, None pro všechna.
         """
         # Zruší aktuálně naplánovanou aktualizaci.
         self._async_unsub_refresh()
@@ -65,12 +570,16 @@ class HeatPumpCoordinator(DataUpdateCoordinator):
 
         try:
             _LOGGER.debug("%s : volani Heat Pump async_fetch_all_data", self.name)
-            await self.hp.async_fetch_all_data()
-            self.last_update_success = True
+            await self._async_fetch(devices)
+            fingerprint = self.hp.content_fingerprint
 
-            # Pokud existují posluchači, naplánuje novou aktualizaci.
-            if self._listeners:
-                self._schedule_refresh()
+            if fingerprint == self.data and self.last_update_success:
+                _LOGGER.debug("%s : data cerpadla se nezmenila", self.name)
+                self.skipped_updates += 1
+                return
+
+            self.data = fingerprint
+            self.last_update_success = True
 
             # Informuje posluchače o aktualizaci.
             self.async_update_listeners()
@@ -78,3 +587,8 @@ class HeatPumpCoordinator(DataUpdateCoordinator):
         except Exception as e:
             _LOGGER.debug("volani Heat Pump async_fetch_all_data probehlo NEuspesne")
             raise UpdateFailed(f"Chyba při aktualizaci dat: {e}")
+
+        finally:
+            # Pokud existují posluchači, naplánuje novou aktualizaci.
+            if self._listeners:
+                self._schedule_refresh()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DOMAIN,
+    DATA,
+)
+
+TO_REDACT = {"ip_address"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """
+    Vrátí diagnostická data konfiguračního záznamu.
+
+    Obsahuje stav koordinátoru a jednotlivých zařízení tepelného čerpadla,
+    včetně počítadel přeskočených analýz a aktualizací.
+    """
+    coordinator = hass.data[DOMAIN][entry.entry_id][DATA]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": str(coordinator.update_interval),
+            "update_interval_reason": coordinator.polling.reason,
+            "skipped_updates": coordinator.skipped_updates,
+            "deduplicated_refreshes": coordinator.deduplicated_refreshes,
+            "throttled_refreshes": coordinator.throttled_refreshes,
+            "queued_writes": coordinator.writes.queued_writes,
+            "sent_write_requests": coordinator.writes.sent_requests,
+            "rejected_writes": coordinator.writes.rejected_writes,
+            "snapshot_version": coordinator.hp.snapshot.version,
+        },
+        "connection": {
+            "breaker_state": coordinator.hp.breaker.state,
+            "breaker_failures": coordinator.hp.breaker.failures,
+            "breaker_trips": coordinator.hp.breaker.trips,
+            "breaker_rejected": coordinator.hp.breaker.rejected,
+            "breaker_retry_in": round(coordinator.hp.breaker.retry_in, 1),
+            "retries": coordinator.hp.retries,
+            "retry_budget_remaining": coordinator.hp.retry_budget.remaining,
+            "retries_denied": coordinator.hp.retry_budget.denied,
+            "stale_limit": coordinator.hp.stale_limit,
+        },
+        "rate_limiter": {
+            "rate": coordinator.hp.rate_limiter.rate,
+            "burst": coordinator.hp.rate_limiter.burst,
+            "tokens": round(coordinator.hp.rate_limiter.tokens, 2),
+            "queue_length": coordinator.hp.rate_limiter.queue_length,
+            "acquired": coordinator.hp.rate_limiter.acquired,
+            "throttled": coordinator.hp.rate_limiter.throttled,
+            "total_wait": round(coordinator.hp.rate_limiter.total_wait, 3),
+            "max_wait": round(coordinator.hp.rate_limiter.max_wait, 3),
+        },
+        "executor": {
+            "queue_depth": coordinator.hp.executor.queue_depth,
+            "max_queue_depth": coordinator.hp.executor.max_queue_depth,
+            "jobs": coordinator.hp.executor.jobs,
+            "average_wait": round(coordinator.hp.executor.average_wait, 4),
+            "max_wait": round(coordinator.hp.executor.max_wait, 4),
+        },
+        "devices": {
+            device.id: {
+                "firmware_version": device.firmware_version,
+                "last_update": device._last_update.isoformat(),
+                "last_error": repr(device.last_error) if device.last_error else None,
+                "skipped_parses": device.skipped_parses,
+                "slow_poll_interval": coordinator.hp.slow_devices.get(device.id),
+                "captured_at": _isoformat(coordinator.hp.snapshot.captured_at[device.id]),
+                "stale_age": coordinator.hp.stale_age(device.id),
+            }
+            for device in coordinator.hp.devices.values()
+        },
+    }
+
+
+def _isoformat(value) -> str | None:
+    """Vrátí čas ve formátu ISO 8601, None zůstane None."""
+    return value.isoformat() if value is not None else None
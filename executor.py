@@ -0,0 +1,87 @@
+"""
+Vlastní omezený exekutor pro blokující požadavky na tepelné čerpadlo.
+
+Požadavky čerpadla neběží ve sdíleném exekutoru Home Assistant, takže pomalé
+čerpadlo nezdržuje ostatní integrace a ony nezdržují dotazování čerpadla.
+Exekutor sleduje délku fronty a dobu čekání požadavků na volné vlákno.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .const import MAX_PARALLEL_REQUESTS
+
+
+class PumpExecutor:
+    """Omezený exekutor jednoho tepelného čerpadla s metrikami fronty."""
+
+    def __init__(self, name: str, max_workers: int = MAX_PARALLEL_REQUESTS) -> None:
+        """
+        Inicializace exekutoru.
+
+        Args:
+            name: Předpona názvu vláken exekutoru.
+            max_workers: Nejvyšší počet souběžných požadavků na čerpadlo.
+        """
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=name
+        )
+        self._lock = threading.Lock()
+        # Počet úloh čekajících na volné vlákno a nejvyšší zaznamenaný počet.
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        # Počet spuštěných úloh, celková a nejdelší doba čekání na vlákno v sekundách.
+        self.jobs = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def average_wait(self) -> float:
+        """Vrátí průměrnou dobu čekání úlohy na volné vlákno v sekundách."""
+        if not self.jobs:
+            return 0.0
+        return self.total_wait / self.jobs
+
+    async def async_run(self, func, *args):
+        """
+        Spustí blokující funkci ve vlákně exekutoru a počká na výsledek.
+
+        Args:
+            func: Blokující funkce.
+            *args: Argumenty funkce.
+
+        Returns:
+            Výsledek funkce.
+        """
+        submitted = time.monotonic()
+
+        def job():
+            wait = time.monotonic() - submitted
+            with self._lock:
+                self.queue_depth -= 1
+                self.jobs += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+            return func(*args)
+
+        with self._lock:
+            self.queue_depth += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        future = self._executor.submit(job)
+        # Zrušená úloha se nespustí, z fronty ji musí odebrat zpětné volání.
+        future.add_done_callback(self._discard_cancelled)
+        return await asyncio.wrap_future(future)
+
+    def _discard_cancelled(self, future) -> None:
+        """Odebere z fronty úlohu, která byla zrušena dřív, než se spustila."""
+        if future.cancelled():
+            with self._lock:
+                self.queue_depth -= 1
+
+    def shutdown(self) -> None:
+        """Zruší čekající úlohy a ukončí vlákna exekutoru po dokončení běžících."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
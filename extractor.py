@@ -0,0 +1,115 @@
+"""
+Rychlé čtení hodnot z tabulek webového rozhraní tepelného čerpadla.
+
+Stránky /http/index.html a /http/edit.html jsou strojově generované tabulky,
+kde každý řádek <tr> nese jednu hodnotu v první buňce <td>. Místo stavby
+celého DOM stromu se stránka projde jednou přímo nad bajty odpovědi a čtení
+skončí hned za posledním potřebným řádkem.
+
+Modul nezávisí na Home Assistant, aby šel samostatně měřit i testovat.
+"""
+
+from __future__ import annotations
+
+import re
+
+_ROW_OPEN = re.compile(rb"<tr[\s>]", re.IGNORECASE)
+_CELL_OPEN = re.compile(rb"<td(?:\s[^>]*)?>", re.IGNORECASE)
+_CELL_CLOSE = re.compile(rb"</td\s*>", re.IGNORECASE)
+_TAG = re.compile(rb"<[^>]*>")
+_VALUE = re.compile(
+    rb"""value\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'/>]+))""", re.IGNORECASE
+)
+
+
+def split_rows(body: bytes, last_row: int | None = None) -> list[bytes]:
+    """
+    Rozdělí stránku na řádky tabulky.
+
+    Řádek sahá od svého <tr> po začátek následujícího <tr>. Procházení
+    skončí, jakmile je znám konec řádku `last_row`.
+
+    Args:
+        body: Tělo odpovědi čerpadla.
+        last_row: Index posledního potřebného řádku, None pro všechny řádky.
+
+    Returns:
+        list[bytes]: Řádky 0 až `last_row` (nebo méně, pokud jich stránka má méně).
+    """
+    if last_row is None:
+        last_row = len(body)
+
+    starts = []
+    for match in _ROW_OPEN.finditer(body):
+        starts.append(match.start())
+        if len(starts) > last_row + 1:
+            break
+
+    rows = [body[start:stop] for start, stop in zip(starts, starts[1:])]
+    if len(starts) <= last_row + 1 and starts:
+        rows.append(body[starts[-1]:])
+    return rows[: last_row + 1]
+
+
+def _cell_bounds(row: bytes) -> tuple[int, int]:
+    """Vrátí začátek a konec obsahu první buňky <td> řádku."""
+    match = _CELL_OPEN.search(row)
+    if match is None:
+        raise ValueError("Radek neobsahuje bunku <td>")
+    start = match.end()
+    close = _CELL_CLOSE.search(row, start)
+    return start, close.start() if close is not None else len(row)
+
+
+def cell_text(row: bytes) -> bytes:
+    """
+    Vrátí text první buňky řádku (odpovídá `tr.td.string` v BeautifulSoup).
+
+    Args:
+        row: Řádek tabulky z `split_rows`.
+
+    Returns:
+        bytes: Text buňky; float() i int() jej přijímají přímo.
+    """
+    start, stop = _cell_bounds(row)
+    text = row[start:stop]
+    if b"<" in text:
+        text = _TAG.sub(b"", text)
+    return text
+
+
+def input_value(row: bytes) -> bytes:
+    """
+    Vrátí atribut value prvního vstupního pole v první buňce řádku.
+
+    Args:
+        row: Řádek tabulky z `split_rows`.
+
+    Returns:
+        bytes: Hodnota atributu value.
+    """
+    start, stop = _cell_bounds(row)
+    match = _VALUE.search(row, start, stop)
+    if match is None:
+        raise ValueError("Bunka neobsahuje atribut value")
+    return match.group(match.lastindex)
+
+
+def row_label(row: bytes) -> str:
+    """
+    Vrátí popisek řádku, tj. text řádku za první buňkou s hodnotou.
+
+    Popisky slouží k rozpoznání rozložení stránky, nikoli ke čtení hodnot.
+
+    Args:
+        row: Řádek tabulky z `split_rows`.
+
+    Returns:
+        str: Text popisku s normalizovanými mezerami.
+    """
+    try:
+        _, stop = _cell_bounds(row)
+    except ValueError:
+        stop = 0
+    text = _TAG.sub(b" ", row[stop:]).decode("utf-8", "replace")
+    return " ".join(text.split())
@@ -0,0 +1,271 @@
+"""
+Rozpoznání rozložení stránek čerpadla podle verze firmware.
+
+Rozložení stránky (na kterém řádku je která hodnota) se určí podle otisku
+stránky, tj. počtu řádků a jejich popisků. Výsledek se uloží do úložiště
+Home Assistant pod tímto otiskem, takže další starty detekci přeskočí.
+Pokud se po aktualizaci firmware řádky posunou, najdou se hodnoty znovu
+podle popisků dříve rozpoznaného rozložení.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import NamedTuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    MONITOR,
+    REGULATOR,
+)
+from .extractor import split_rows, row_label
+from .schema import (
+    MONITOR_SCHEMA,
+    REGULATOR_SCHEMA,
+    PageSchema,
+    PageExtractor,
+)
+
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = DOMAIN + "_layouts"
+SAVE_DELAY = 10
+
+
+
+class LayoutError(Exception):
+    """Rozložení stránky se nepodařilo rozpoznat."""
+
+
+class KnownLayout(NamedTuple):
+    """Referenční rozložení stránky známé verze firmware."""
+
+    schema: PageSchema
+    labels: dict[str, str]
+
+    def matches(self, labels: list[str]) -> bool:
+        """
+        Ověří, že stránka má na řádcích rozložení očekávané popisky.
+
+        Rozložení bez zaznamenaných popisků neodpovídá žádné stránce.
+
+        Args:
+            labels: Popisky řádků kontrolované stránky.
+        """
+        if not self.labels:
+            return False
+        for field in self.schema.fields:
+            if field.row >= len(labels):
+                return False
+            if labels[field.row] != self.labels.get(field.name):
+                return False
+        return True
+
+
+# Známá rozložení stránek podle verze firmware. Popisky řádků se musí
+# zaznamenat ze stránek čerpadla s danou verzí firmware, rozložení bez
+# popisků se při detekci nepoužije.
+KNOWN_LAYOUTS: dict[str, dict[str, KnownLayout]] = {
+    "0.1.1": {
+        MONITOR: KnownLayout(MONITOR_SCHEMA, {}),
+        REGULATOR: KnownLayout(REGULATOR_SCHEMA, {}),
+    },
+}
+
+
+class Layout(NamedTuple):
+    """Rozpoznané rozložení jedné stránky."""
+
+    fingerprint: str
+    firmware: str
+    rows: dict[str, int]
+    labels: dict[str, str]
+
+    def apply(self, schema: PageSchema) -> PageSchema:
+        """Vrátí popis stránky s řádky podle tohoto rozložení."""
+        return schema._replace(
+            fields=tuple(
+                field._replace(row=self.rows[field.name]) for field in schema.fields
+            )
+        )
+
+    def extractor(self, schema: PageSchema) -> PageExtractor:
+        """
+        Vrátí zkompilované čtení stránky podle tohoto rozložení.
+
+        Popisky prvního a posledního čteného řádku se kontrolují při každém
+        čtení, jejich změna vyvolá novou detekci.
+        """
+        schema = self.apply(schema)
+        rows = sorted(schema.fields, key=lambda field: field.row)
+        sentinels = {
+            field.row: self.labels[field.name] for field in (rows[0], rows[-1])
+        }
+        return PageExtractor(schema, sentinels)
+
+
+def fingerprint(labels: list[str]) -> str:
+    """Vrátí otisk stránky z počtu řádků a jejich popisků."""
+    digest = hashlib.sha1(str(len(labels)).encode())
+    for label in labels:
+        digest.update(b"\n" + label.encode())
+    return digest.hexdigest()
+
+
+class LayoutManager:
+    """
+    Správa rozložení stránek jednoho tepelného čerpadla.
+
+    Rozpoznaná rozložení jsou uložena podle otisku stránky, pro každé
+    zařízení čerpadla je navíc uložen otisk naposledy použitého rozložení.
+    """
+
+    def __init__(self, hass: HomeAssistant, ip_address: str) -> None:
+        """
+        Inicializace správy rozložení.
+
+        Args:
+            hass: Instance HomeAssistant pro přístup k úložišti.
+            ip_address: IP adresa tepelného čerpadla.
+        """
+        self._hass = hass
+        self._ip = ip_address
+        # Každé čerpadlo má vlastní úložiště, takže se zápisy různých
+        # konfiguračních záznamů navzájem nepřepisují.
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY + "_" + ip_address)
+        self._data = {"layouts": {}, "devices": {}}
+
+    async def async_load(self) -> None:
+        """Načte uložená rozložení."""
+        data = await self._store.async_load()
+        if data is not None:
+            self._data = data
+
+    def current(self, device_id: str) -> Layout | None:
+        """Vrátí naposledy použité rozložení zařízení, pokud je uloženo."""
+        fp = self._data["devices"].get(self._ip + "/" + device_id)
+        return self._stored(fp)
+
+    def remember(self, device_id: str, layout: Layout) -> None:
+        """
+        Uloží rozložení jako aktuální rozložení zařízení.
+
+        Volá se ve smyčce událostí, zápis do úložiště je odložený.
+        """
+        self._data["layouts"][layout.fingerprint] = {
+            "firmware": layout.firmware,
+            "rows": layout.rows,
+            "labels": layout.labels,
+        }
+        self._data["devices"][self._ip + "/" + device_id] = layout.fingerprint
+        self._store.async_delay_save(lambda: self._data, SAVE_DELAY)
+
+    def detect(self, device_id: str, schema: PageSchema, body: bytes) -> Layout:
+        """
+        Rozpozná rozložení stránky.
+
+        Postupně zkouší uložené rozložení se stejným otiskem, odvození řádků
+        podle popisků dříve rozpoznaných rozložení a nakonec známá rozložení
+        firmware, jejichž popisky řádků musí odpovídat stránce. Metoda je
+        blokující a volá se v exekutoru, nic neukládá.
+
+        Args:
+            device_id: Identifikátor zařízení (monitor, regulator).
+            schema: Výchozí popis stránky zařízení.
+            body: Tělo odpovědi čerpadla.
+
+        Returns:
+            Layout: Rozpoznané rozložení.
+
+        Raises:
+            LayoutError: Pokud rozložení nelze rozpoznat.
+        """
+        rows = split_rows(body)
+        labels = [row_label(row) for row in rows]
+        fp = fingerprint(labels)
+
+        layout = self._stored(fp)
+        if layout is not None:
+            return layout
+
+        names = [field.name for field in schema.fields]
+        for stored in list(self._data["layouts"].values()):
+            if set(stored["labels"]) != set(names):
+                continue
+            derived = self._derive(fp, stored, labels)
+            if derived is not None and self._valid(derived, schema, body):
+                _LOGGER.info(
+                    "%s : rozlozeni stranky %s odvozeno z firmware %s",
+                    device_id,
+                    schema.page,
+                    stored["firmware"],
+                )
+                return derived
+
+        for firmware, layouts in KNOWN_LAYOUTS.items():
+            known = layouts.get(device_id)
+            if known is None or [f.name for f in known.schema.fields] != names:
+                continue
+            if not known.matches(labels):
+                _LOGGER.debug(
+                    "%s : popisky stranky %s neodpovidaji firmware %s",
+                    device_id,
+                    schema.page,
+                    firmware,
+                )
+                continue
+            layout = Layout(
+                fp,
+                firmware,
+                {field.name: field.row for field in known.schema.fields},
+                dict(known.labels),
+            )
+            if self._valid(layout, known.schema, body):
+                _LOGGER.info(
+                    "%s : stranka %s odpovida firmware %s",
+                    device_id,
+                    schema.page,
+                    firmware,
+                )
+                return layout
+
+        raise LayoutError(f"Nezname rozlozeni stranky {schema.page}")
+
+    def _stored(self, fp: str | None) -> Layout | None:
+        """Vrátí uložené rozložení podle otisku."""
+        stored = self._data["layouts"].get(fp)
+        if stored is None:
+            return None
+        return Layout(fp, stored["firmware"], stored["rows"], stored["labels"])
+
+    def _derive(self, fp: str, stored: dict, labels: list[str]) -> Layout | None:
+        """Najde řádky uloženého rozložení podle jejich jednoznačných popisků."""
+        positions = {}
+        for row, label in enumerate(labels):
+            positions[label] = None if label in positions else row
+
+        rows = {}
+        for name, label in stored["labels"].items():
+            row = positions.get(label)
+            if row is None:
+                return None
+            rows[name] = row
+
+        firmware = stored["firmware"].split(" ")[0] + " (" + fp[:8] + ")"
+        return Layout(fp, firmware, rows, dict(stored["labels"]))
+
+    def _valid(self, layout: Layout, schema: PageSchema, body: bytes) -> bool:
+        """Ověří, že podle rozložení lze přečíst všechny hodnoty stránky."""
+        if len(layout.labels) != len(layout.rows):
+            return False
+        try:
+            layout.extractor(schema).extract(body)
+        except (LookupError, ValueError, TypeError):
+            return False
+        return True
@@ -15,6 +15,7 @@ from homeassistant.core import (
     callback,
 )
 
+from .coordinator import listener_context, stale_attributes
 from .const import (
     DOMAIN,
     DATA,
@@ -114,6 +115,8 @@ class NumberBase(CoordinatorEntity, NumberEntity):
         super().__init__(coordinator)
         self._device_type = device_type
         self._device = self.coordinator.hp.devices[device_type]
+        # Entita je informována jen o změně dostupnosti a svých klíčů.
+        self.coordinator_context = listener_context(device_type)
 
     @property
     def device_info(self):
@@ -125,6 +128,11 @@ class NumberBase(CoordinatorEntity, NumberEntity):
         """Vrací dostupnost entity."""
         return self._device.get_availability()
 
+    @property
+    def extra_state_attributes(self):
+        """Vrací stáří zobrazených dat, pokud se je nepodařilo obnovit."""
+        return stale_attributes(self.coordinator.hp, self._device.id)
+
     @callback
     def _handle_coordinator_update(self) -> None:
         """Zpracuje aktualizovaná data od koordinátora."""
@@ -149,6 +157,8 @@ class TemperatureNumber(NumberBase):
 
         # Nastavení základních vlastností entity
         self._id = name.replace(" ", "_").casefold()
+        self.coordinator_context = listener_context(device_type, self._id)
+        self._value = self._device.accessor(self._id)
         self._attr_name = name
         self._attr_unique_id = self._device.id + "_" + self._id
         self.entity_id = "number." + self._device.id + "_" + self._id
@@ -166,7 +176,7 @@ class TemperatureNumber(NumberBase):
     @property
     def state(self):
         """Vrací aktuální nastavenou teplotu."""
-        return self._device.get_state(self._id)
+        return self._value()
 
     @property
     def icon(self):
@@ -177,8 +187,8 @@ class TemperatureNumber(NumberBase):
         """
         Asynchronně nastaví novou teplotní hodnotu.
         
-        Tato metoda volá funkce pro aktualizaci dat tepelného čerpadla,
-        následně pomocí koordinátoru aktualizuje hodnoty.
+        Hodnota se zapíše přes frontu zápisů koordinátoru, která zápisy
+        z krátkého okna odešle společně a následně aktualizuje hodnoty.
         """
         _LOGGER.debug(
             "%s : async_set_native_value volano s hodnotou: %s",
@@ -186,8 +196,5 @@ class TemperatureNumber(NumberBase):
             new_value,
         )
 
-        _LOGGER.debug("%s : volani Heat Pump async_upload_data", self.entity_id)
-        await self._device.async_upload_data(self._key, new_value)
-
-        _LOGGER.debug("%s : volani Coordinator async_set_updated_data", self.entity_id)
-        await self.coordinator.async_set_updated_data()
+        _LOGGER.debug("%s : volani Coordinator async_write", self.entity_id)
+        await self.coordinator.async_write(self._key, new_value)
@@ -0,0 +1,118 @@
+"""
+Adaptivní interval dotazování tepelného čerpadla.
+
+Interval se zkrátí na minimum, když se změní provozní stav čerpadla
+(kompresor, odtávání, alarm, elektrokotel), když probíhá odtávání nebo když
+se rychle mění teploty. Při stabilních hodnotách se postupně prodlužuje
+až na maximum.
+"""
+
+from __future__ import annotations
+
+import time
+
+from .const import (
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_MAX_INTERVAL,
+    POLL_BACKOFF,
+    POLL_TEMPERATURE_RATE,
+)
+
+# Stavové klíče monitoru, jejichž změna zkrátí interval.
+STATE_KEYS = (
+    "kompresor",
+    "odtaveni",
+    "podminka_odtaveni",
+    "alarm",
+    "kod_alarmu",
+    "3_alarmy",
+    "elektrokotel_1",
+    "elektrokotel_2",
+)
+# Teploty monitoru, jejichž rychlá změna zkrátí interval.
+TEMPERATURE_KEYS = ("teplota_topne_vody", "venkovni_teplota")
+
+# Důvody aktuálního intervalu.
+REASON_START = "start"
+REASON_STATE_CHANGE = "zmena_stavu"
+REASON_DEFROST = "odtaveni"
+REASON_TEMPERATURE = "rychla_zmena_teploty"
+REASON_STABLE = "stabilni"
+
+
+class AdaptivePolling:
+    """Výpočet intervalu dotazování podle provozního stavu čerpadla."""
+
+    def __init__(
+        self,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        backoff: float = POLL_BACKOFF,
+        temperature_rate: float = POLL_TEMPERATURE_RATE,
+    ) -> None:
+        """
+        Inicializace výpočtu intervalu.
+
+        Args:
+            min_interval: Nejkratší interval v sekundách.
+            max_interval: Nejdelší interval v sekundách.
+            backoff: Násobek prodloužení intervalu při stabilních hodnotách.
+            temperature_rate: Rychlost změny teploty ve °C/min, od které
+                se dotazuje s nejkratším intervalem.
+        """
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self._backoff = backoff
+        self._temperature_rate = temperature_rate
+
+        self.interval = self.min_interval
+        self.reason = REASON_START
+        self._states = None
+        self._temperatures = None
+        self._at = None
+
+    def update(self, monitor) -> float:
+        """
+        Určí interval dotazování podle nově načtených dat monitoru.
+
+        Args:
+            monitor: Monitor tepelného čerpadla s aktuálními daty.
+
+        Returns:
+            float: Interval do dalšího dotazu v sekundách.
+        """
+        now = time.monotonic()
+        states = tuple(monitor.get_state(key) for key in STATE_KEYS)
+        temperatures = tuple(monitor.get_state(key) for key in TEMPERATURE_KEYS)
+
+        reason = self._fast_reason(states, temperatures, now)
+        if reason is not None:
+            self.interval = self.min_interval
+            self.reason = reason
+        elif self._states is not None:
+            self.interval = min(self.interval * self._backoff, self.max_interval)
+            self.reason = REASON_STABLE
+
+        self._states = states
+        self._temperatures = temperatures
+        self._at = now
+        return self.interval
+
+    def _fast_reason(self, states: tuple, temperatures: tuple, now: float):
+        """Vrátí důvod pro nejkratší interval, None pokud jsou hodnoty stabilní."""
+        if self._states is None:
+            return None
+        if states != self._states:
+            return REASON_STATE_CHANGE
+        if states[STATE_KEYS.index("odtaveni")] == 1:
+            return REASON_DEFROST
+
+        # Krátký interval od minulého čtení (ruční aktualizace) nezvětšuje šum.
+        minutes = max(now - self._at, self.min_interval) / 60
+        for old, new in zip(self._temperatures, temperatures):
+            if old is None or new is None:
+                continue
+            if abs(new - old) / minutes >= self._temperature_rate:
+                return REASON_TEMPERATURE
+        return None
+
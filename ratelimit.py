@@ -0,0 +1,116 @@
+"""
+Omezení rychlosti požadavků na webový server tepelného čerpadla.
+
+Všechny požadavky čerpadla čerpají z jednoho zásobníku tokenů. Požadavek,
+na který token nezbyl, čeká ve frontě podle priority, zápisy mají přednost
+před pravidelným načítáním dat.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+
+from .const import (
+    DEFAULT_REQUEST_RATE,
+    DEFAULT_REQUEST_BURST,
+    PRIORITY_READ,
+)
+
+
+class TokenBucket:
+    """Zásobník tokenů s prioritní frontou čekajících požadavků."""
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_REQUEST_RATE,
+        burst: int = DEFAULT_REQUEST_BURST,
+    ) -> None:
+        """
+        Inicializace zásobníku tokenů.
+
+        Args:
+            rate: Počet tokenů doplněných za sekundu.
+            burst: Velikost zásobníku, tj. nejvyšší počet požadavků najednou.
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waiters: list = []
+        self._sequence = itertools.count()
+        self._timer = None
+        # Počet povolených požadavků, počet požadavků, které musely čekat,
+        # a celková a nejdelší doba čekání v sekundách.
+        self.acquired = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def tokens(self) -> float:
+        """Vrátí aktuální počet tokenů v zásobníku."""
+        self._refill()
+        return self._tokens
+
+    @property
+    def queue_length(self) -> int:
+        """Vrátí počet požadavků čekajících na token."""
+        return sum(1 for _, _, waiter in self._waiters if not waiter.done())
+
+    async def async_acquire(self, priority: int = PRIORITY_READ) -> None:
+        """
+        Počká na token pro jeden požadavek.
+
+        Args:
+            priority: Priorita požadavku, menší číslo má přednost.
+        """
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            self.acquired += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), waiter))
+        self.throttled += 1
+        started = time.monotonic()
+        self._schedule()
+        await waiter
+
+        wait = time.monotonic() - started
+        self.acquired += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def _refill(self) -> None:
+        """Doplní tokeny za dobu od posledního doplnění."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _schedule(self) -> None:
+        """Naplánuje přidělení tokenu čekajícím požadavkům."""
+        if self._timer is not None or not self._waiters:
+            return
+        delay = max(0.0, (1 - self._tokens) / self.rate)
+        self._timer = asyncio.get_running_loop().call_later(delay, self._release)
+
+    def _release(self) -> None:
+        """Přidělí dostupné tokeny čekajícím požadavkům podle priority."""
+        self._timer = None
+        self._refill()
+        while self._waiters:
+            waiter = self._waiters[0][2]
+            if waiter.done():
+                # Zrušený požadavek token nečerpá.
+                heapq.heappop(self._waiters)
+                continue
+            if self._tokens < 1:
+                break
+            heapq.heappop(self._waiters)
+            self._tokens -= 1
+            waiter.set_result(None)
+        self._schedule()
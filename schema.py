@@ -0,0 +1,399 @@
+"""
+Deklarativní popis stránek webového rozhraní tepelného čerpadla.
+
+Každá stránka je popsána seznamem polí: řádek tabulky, klíč atributu, typ,
+topný okruh, volitelná transformace a klíč parametru pro zápis. Popis se při startu zkompiluje do jedné
+funkce pro čtení stránky, která vrací neměnný snímek hodnot zařízení (Snapshot).
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Callable, Mapping, NamedTuple
+
+from .const import (
+    INDEX_PAGE,
+    EDIT_PAGE,
+)
+from .extractor import split_rows, cell_text, input_value, row_label
+
+
+class LayoutChanged(Exception):
+    """Rozložení stránky neodpovídá rozložení, podle kterého se čte."""
+
+
+def invert_binary(value: int) -> int:
+    """Vrátí opačnou hodnotu binárního stavu."""
+    if value == 1:
+        return 0
+    return 1
+
+
+class Field(NamedTuple):
+    """Jedna hodnota stránky čerpadla."""
+
+    row: int
+    key: str
+    type: Callable = float
+    circuit: str | None = None
+    transform: Callable | None = None
+    # Klíč parametru script:var, kterým se hodnota pole zapisuje do čerpadla.
+    write_key: str | None = None
+
+    @property
+    def name(self) -> str:
+        """Vrátí klíč pole včetně topného okruhu, např. "to1_venku_bod_a"."""
+        if self.circuit is None:
+            return self.key
+        return self.circuit + "_" + self.key
+
+
+class PageSchema(NamedTuple):
+    """Popis jedné stránky čerpadla."""
+
+    page: str
+    reader: Callable[[bytes], bytes]
+    fields: tuple[Field, ...]
+
+
+MONITOR_SCHEMA = PageSchema(
+    INDEX_PAGE,
+    cell_text,
+    (
+        Field(1, "teplota_topne_vody", float),
+        Field(2, "venkovni_teplota", float),
+        Field(5, "zadana_teplota_topne_vody", float),
+        Field(6, "rychle_nastaveni_topne_vody", float, write_key="(0,2,123,00.0,47.5)"),
+        Field(7, "nastaveni_eev", float),
+        Field(8, "rezim_zima", int),
+        Field(8, "rezim_leto", int, transform=invert_binary),
+        Field(12, "kompresor", int),
+        Field(13, "obehove_cerpadlo", int),
+        Field(15, "ventilator", int),
+        Field(16, "elektrokotel_1", int),
+        Field(17, "elektrokotel_2", int),
+        Field(24, "podminka_odtaveni", int),
+        Field(25, "alarm", int),
+        Field(26, "kod_alarmu", int),
+        Field(27, "3_alarmy", int),
+        Field(28, "reset_3_alarmu", int),
+        Field(30, "odtaveni", int),
+        Field(31, "cas_od_odtaveni", int),
+        Field(33, "zapnuto", int),
+        Field(36, "venku_bod_a", float),
+        Field(37, "topna_voda_bod_a", float, write_key="(0,2,37,20.0,50.0)"),
+        Field(38, "venku_bod_b", float),
+        Field(39, "topna_voda_bod_b", float, write_key="(0,2,38,20.0,50.0)"),
+        Field(
+            40, "teplota_povoleni_elektrokotle", float, write_key="(0,2,39,-20.0,30.0)"
+        ),
+        Field(42, "hodiny_kompresoru", int),
+        Field(43, "starty_kompresoru", int),
+        Field(44, "hodiny_cerpadla", int),
+        Field(51, "pocet_chyb_ventilatoru", int),
+        Field(52, "pocet_chyb_kompresoru", int),
+        Field(53, "pocet_chyb_protimrazu", int),
+        Field(55, "skutecna_teplota", float, "to1"),
+        Field(56, "zadana_teplota", float, "to1"),
+        Field(57, "venku_bod_a", float, "to1"),
+        Field(58, "topna_voda_bod_a", float, "to1"),
+        Field(59, "venku_bod_b", float, "to1"),
+        Field(60, "topna_voda_bod_b", float, "to1"),
+        Field(61, "hystereze", float, "to1"),
+        Field(62, "rychle_nastaveni_teploty", float, "to1"),
+        Field(63, "analogovy_vystup", float, "to1"),
+        Field(64, "digitalni_vystup", int, "to1"),
+        Field(77, "skutecna_teplota", float, "to3"),
+        Field(78, "zadana_teplota", float, "to3"),
+        Field(79, "venku_bod_a", float, "to3"),
+        Field(80, "topna_voda_bod_a", float, "to3"),
+        Field(81, "venku_bod_b", float, "to3"),
+        Field(82, "topna_voda_bod_b", float, "to3"),
+        Field(83, "hystereze", float, "to3"),
+        Field(84, "rychle_nastaveni_teploty", float, "to3"),
+        Field(85, "digitalni_vystup", int, "to3"),
+    ),
+)
+
+REGULATOR_SCHEMA = PageSchema(
+    EDIT_PAGE,
+    input_value,
+    (
+        Field(1, "restart_3_alarmu", int),
+        Field(2, "zapnuto", int),
+        Field(3, "teplota_prepnuti_leto", float, write_key="(0,2,83,-20,30)"),
+        Field(4, "teplota_prepnuti_zima", float, write_key="(0,2,82,-20,30)"),
+        Field(5, "rezim_zima_leto", int, write_key="(0,3,50,0,2)"),
+        Field(
+            7, "rychle_nastaveni_topne_vody", float, write_key="(0,2,123,00.0,47.5)"
+        ),
+        Field(8, "venku_bod_a", float),
+        Field(9, "topna_voda_bod_a", float, write_key="(0,2,37,20.0,50.0)"),
+        Field(10, "venku_bod_b", float),
+        Field(11, "topna_voda_bod_b", float, write_key="(0,2,38,20.0,50.0)"),
+        Field(
+            12, "teplota_povoleni_elektrokotle", float, write_key="(0,2,39,-20.0,30.0)"
+        ),
+        Field(19, "program_okruhu", int, "to1"),
+        Field(20, "venku_bod_a", float, "to1"),
+        Field(21, "topna_voda_bod_a", float, "to1"),
+        Field(22, "venku_bod_b", float, "to1"),
+        Field(23, "topna_voda_bod_b", float, "to1"),
+        Field(24, "rychle_nastaveni_teploty", float, "to1"),
+        Field(33, "program_okruhu", int, "to3"),
+        Field(34, "venku_bod_a", float, "to3"),
+        Field(35, "topna_voda_bod_a", float, "to3"),
+        Field(36, "venku_bod_b", float, "to3"),
+        Field(37, "topna_voda_bod_b", float, "to3"),
+        Field(38, "rychle_nastaveni_teploty", float, "to3"),
+    ),
+)
+
+
+class Snapshot:
+    """
+    Neměnný snímek hodnot jednoho zařízení.
+
+    Hodnoty jsou uloženy v n-tici, pozici klíče určuje mapa offsetů sdílená
+    všemi snímky stejné stránky. Klíče jsou ploché včetně topného okruhu,
+    např. "to1_venku_bod_a". Nové hodnoty vždy vytvoří nový snímek, takže
+    se snímek zařízení vyměňuje jako celek.
+    """
+
+    __slots__ = ("_offsets", "values")
+
+    def __init__(self, offsets: dict[str, int], values: tuple) -> None:
+        """
+        Vytvoří snímek.
+
+        Args:
+            offsets: Pozice hodnot podle klíče.
+            values: Hodnoty v pořadí offsetů.
+        """
+        object.__setattr__(self, "_offsets", offsets)
+        object.__setattr__(self, "values", values)
+
+    def __setattr__(self, name, value):
+        """Snímek je neměnný."""
+        raise AttributeError("Snapshot je nemenny")
+
+    def __getitem__(self, key: str):
+        """Vrátí hodnotu klíče, KeyError pro neznámý klíč."""
+        return self.values[self._offsets[key]]
+
+    def __contains__(self, key: str) -> bool:
+        """Zjistí, zda snímek obsahuje klíč."""
+        return key in self._offsets
+
+    def keys(self):
+        """Vrátí klíče snímku v pořadí offsetů."""
+        return self._offsets.keys()
+
+    def replace(self, updates: dict) -> Snapshot:
+        """
+        Vrátí nový snímek se změněnými hodnotami.
+
+        Args:
+            updates: Nové hodnoty podle klíče.
+        """
+        values = list(self.values)
+        for key, value in updates.items():
+            values[self._offsets[key]] = value
+        return Snapshot(self._offsets, tuple(values))
+
+
+class PumpSnapshot(NamedTuple):
+    """
+    Společný neměnný snímek všech zařízení čerpadla.
+
+    Snímek se vyměňuje jako celek, takže hodnoty monitoru i regulátoru přečtené
+    z jednoho snímku vždy patří k sobě. Verze se zvyšuje jen se změnou hodnot
+    některého zařízení, shodná verze tedy znamená shodné hodnoty.
+    """
+
+    version: int
+    # Snímky hodnot podle identifikátoru zařízení.
+    devices: Mapping[str, Snapshot]
+    # Čas posledního úspěšného načtení zařízení, None před prvním načtením.
+    captured_at: Mapping[str, datetime | None]
+
+    def get(self, device_id: str, key: str):
+        """
+        Vrátí hodnotu klíče zařízení.
+
+        Args:
+            device_id: Identifikátor zařízení (monitor, regulator).
+            key: Klíč atributu, u topného okruhu včetně okruhu.
+        """
+        return self.devices[device_id][key]
+
+
+class PageExtractor:
+    """
+    Zkompilovaný popis stránky.
+
+    Pole jsou při vytvoření seřazena podle řádků a převedena na n-tice kroků
+    s pevnými offsety ve snímku, takže čtení stránky je jediný průchod bez
+    dalšího rozhodování.
+    """
+
+    def __init__(
+        self,
+        schema: PageSchema,
+        sentinels: dict[int, str] | None = None,
+    ) -> None:
+        """
+        Zkompiluje popis stránky.
+
+        Args:
+            schema: Popis stránky.
+            sentinels: Očekávané popisky vybraných řádků podle jejich indexu,
+                kontrolují se při každém čtení.
+        """
+        self.page = schema.page
+        self._sentinels = tuple((sentinels or {}).items())
+        self.last_row = max(field.row for field in schema.fields)
+        self._reader = schema.reader
+
+        circuits = dict.fromkeys(f.circuit for f in schema.fields if f.circuit)
+        # Každý okruh dostane všechny klíče okruhů, i když je stránka nemá vyplněné.
+        circuit_keys = dict.fromkeys(f.key for f in schema.fields if f.circuit)
+        self.keys = tuple(
+            dict.fromkeys(
+                [f.key for f in schema.fields if f.circuit is None]
+                + [c + "_" + key for c in circuits for key in circuit_keys]
+            )
+        )
+        self._offsets = {key: offset for offset, key in enumerate(self.keys)}
+        self._empty = Snapshot(self._offsets, (None,) * len(self.keys))
+
+        self._steps = tuple(
+            (field.row, self._offsets[field.name], field.type, field.transform)
+            for field in sorted(schema.fields, key=lambda field: field.row)
+        )
+        # Zapisovatelná pole podle klíče parametru, jen pole mimo topné okruhy.
+        self._writes = {
+            field.write_key: (field.key, field.type)
+            for field in schema.fields
+            if field.write_key is not None and field.circuit is None
+        }
+
+    def offset(self, key: str) -> int:
+        """
+        Vrátí pozici hodnoty klíče ve snímcích této stránky.
+
+        Pozice závisí jen na popisu stránky, ne na jejím rozložení.
+
+        Raises:
+            KeyError: Pokud stránka klíč nemá.
+        """
+        try:
+            return self._offsets[key]
+        except KeyError:
+            raise KeyError(f"Neznamy klic {key!r} stranky {self.page}") from None
+
+    def new_snapshot(self) -> Snapshot:
+        """Vrátí snímek zařízení bez načtených hodnot."""
+        return self._empty
+
+    def changed_keys(self, old: Snapshot, new: Snapshot) -> list[str]:
+        """
+        Vrátí klíče, jejichž hodnota se mezi dvěma snímky zařízení liší.
+
+        Args:
+            old: Předchozí snímek zařízení.
+            new: Nový snímek zařízení.
+
+        Returns:
+            list[str]: Klíče včetně topného okruhu, např. "to1_venku_bod_a".
+        """
+        return [
+            key
+            for key, old_value, new_value in zip(self.keys, old.values, new.values)
+            if old_value != new_value
+        ]
+
+    def affected_by(self, values: dict) -> bool:
+        """Zjistí, zda stránka obsahuje některý ze zapsaných parametrů."""
+        return not self._writes.keys().isdisjoint(values)
+
+    def apply_writes(
+        self, snapshot: Snapshot, values: dict
+    ) -> tuple[Snapshot, list[str]]:
+        """
+        Vrátí snímek zařízení doplněný o hodnoty zapsaných parametrů.
+
+        Parametry bez pole na této stránce se přeskočí.
+
+        Args:
+            snapshot: Aktuální snímek zařízení.
+            values: Zapsané hodnoty podle klíče parametru.
+
+        Returns:
+            tuple: Nový snímek zařízení a seznam změněných klíčů.
+        """
+        updates = {}
+        for write_key, value in values.items():
+            value = self._written_value(write_key, value)
+            if value is None:
+                continue
+            key = self._writes[write_key][0]
+            if snapshot[key] != value:
+                updates[key] = value
+        if not updates:
+            return snapshot, []
+        return snapshot.replace(updates), list(updates)
+
+    def unconfirmed_writes(self, snapshot: Snapshot, values: dict) -> list[str]:
+        """
+        Vrátí klíče parametrů, jejichž zapsanou hodnotu snímek neobsahuje.
+
+        Args:
+            snapshot: Snímek zařízení přečtený po zápisu.
+            values: Zapsané hodnoty podle klíče parametru.
+
+        Returns:
+            list[str]: Klíče parametrů, které čerpadlo nepřijalo.
+        """
+        unconfirmed = []
+        for write_key, value in values.items():
+            value = self._written_value(write_key, value)
+            if value is not None and snapshot[self._writes[write_key][0]] != value:
+                unconfirmed.append(write_key)
+        return unconfirmed
+
+    def _written_value(self, write_key: str, value):
+        """Převede zapsanou hodnotu na typ pole, None pokud pole neexistuje."""
+        if write_key not in self._writes:
+            return None
+        try:
+            return self._writes[write_key][1](value)
+        except (TypeError, ValueError):
+            return None
+
+    def extract(self, body: bytes) -> Snapshot:
+        """
+        Přečte stránku a vrátí z ní nový snímek zařízení.
+
+        Args:
+            body: Tělo odpovědi čerpadla.
+
+        Returns:
+            Snapshot: Hodnoty zařízení a topných okruhů.
+
+        Raises:
+            LayoutChanged: Pokud kontrolní řádky nemají očekávané popisky.
+        """
+        rows = split_rows(body, self.last_row)
+        for row, label in self._sentinels:
+            if row >= len(rows) or row_label(rows[row]) != label:
+                raise LayoutChanged(f"Radek {row} nema popisek {label!r}")
+        reader = self._reader
+
+        values = list(self._empty.values)
+        for row, offset, convert, transform in self._steps:
+            value = convert(reader(rows[row]))
+            if transform is not None:
+                value = transform(value)
+            values[offset] = value
+        return Snapshot(self._offsets, tuple(values))
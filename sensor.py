@@ -16,10 +16,19 @@ from homeassistant.core import (
     callback,
 )
 
+from homeassistant.helpers.entity import EntityCategory
+from homeassistant.helpers.event import async_call_later
+
+import time
+
+from .coordinator import listener_context, stale_attributes
 from .const import (
     DOMAIN,
     DATA,
     MONITOR,
+    TEMPERATURE_DEADBAND,
+    DEADBAND_MAX_INTERVAL,
+    POLL_INTERVAL_KEY,
 )
 
 
@@ -90,6 +99,8 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
 
     new_entities.append(TemperatureSensor(coordinator, MONITOR, "TO3 Skutecna teplota"))
 
+    new_entities.append(PollingIntervalSensor(coordinator, MONITOR))
+
     if new_entities:
         async_add_entities(new_entities)
 
@@ -99,14 +110,38 @@ class SensorBase(CoordinatorEntity, SensorEntity):
     Základní třída pro všechny senzory v integraci.
     
     Poskytuje společné vlastnosti a metody pro senzory, včetně dostupnosti a aktualizace dat.
+
+    Pokud má senzor nastavené pásmo necitlivosti (deadband), zapíše nový stav jen
+    při změně hodnoty o více než deadband, nebo po uplynutí max_publish_interval
+    sekund od posledního zápisu. Potlačená hodnota se zapíše nejpozději
+    po uplynutí max_publish_interval, i když už žádná aktualizace nepřijde.
     """
     should_poll = False
 
-    def __init__(self, coordinator, device_type):
+    # Výchozí pásmo necitlivosti třídy senzoru, None = zapisovat každou změnu.
+    deadband = None
+    max_publish_interval = DEADBAND_MAX_INTERVAL
+
+    def __init__(
+        self, coordinator, device_type, deadband=None, max_publish_interval=None
+    ):
         """Inicializuje základní senzorovou entitu."""
         super().__init__(coordinator)
         self._device_type = device_type
         self._device = self.coordinator.hp.devices[device_type]
+        # Entita je informována jen o změně dostupnosti a svých klíčů.
+        self.coordinator_context = listener_context(device_type)
+
+        if deadband is not None:
+            self.deadband = deadband
+        if max_publish_interval is not None:
+            self.max_publish_interval = max_publish_interval
+        self._published_value = None
+        self._published_available = None
+        self._published_attributes = None
+        self._published_at = 0.0
+        # Naplánovaný zápis potlačené hodnoty.
+        self._unsub_publish = None
 
     @property
     def device_info(self):
@@ -118,12 +153,75 @@ class SensorBase(CoordinatorEntity, SensorEntity):
         """Vrací dostupnost senzorové entity."""
         return self._device.get_availability()
 
+    @property
+    def extra_state_attributes(self):
+        """Vrací stáří zobrazených dat, pokud se je nepodařilo obnovit."""
+        return stale_attributes(self.coordinator.hp, self._device.id)
+
     @callback
     def _handle_coordinator_update(self) -> None:
         """Zpracovává aktualizaci dat z koordinátora."""
         self._device = self.coordinator.hp.devices[self._device_type]
+
+        value = self._value()
+        available = self.available
+        attributes = self.extra_state_attributes
+        if self._within_deadband(value, available, attributes):
+            if self._unsub_publish is None:
+                since = time.monotonic() - self._published_at
+                delay = max(self.max_publish_interval - since, 0)
+                self._unsub_publish = async_call_later(
+                    self.hass, delay, self._publish_pending
+                )
+            return
+
+        self._publish(value, available, attributes)
+
+    @callback
+    def _publish_pending(self, _now) -> None:
+        """Zapíše hodnotu potlačenou pásmem necitlivosti."""
+        self._unsub_publish = None
+        self._publish(self._value(), self.available, self.extra_state_attributes)
+
+    @callback
+    def _publish(self, value, available, attributes) -> None:
+        """Zapíše stav entity a zruší naplánovaný zápis potlačené hodnoty."""
+        if self._unsub_publish is not None:
+            self._unsub_publish()
+            self._unsub_publish = None
+        self._published_value = value
+        self._published_available = available
+        self._published_attributes = attributes
+        self._published_at = time.monotonic()
         self.async_write_ha_state()
 
+    async def async_will_remove_from_hass(self) -> None:
+        """Zruší naplánovaný zápis potlačené hodnoty."""
+        if self._unsub_publish is not None:
+            self._unsub_publish()
+            self._unsub_publish = None
+        await super().async_will_remove_from_hass()
+
+    def _within_deadband(self, value, available, attributes) -> bool:
+        """
+        Určí, zda se má zápis nové hodnoty potlačit.
+
+        Returns:
+            True, pokud se hodnota změnila nejvýše o deadband, dostupnost
+            ani atributy se nezměnily a od posledního zápisu neuplynul
+            max_publish_interval.
+        """
+        if not self.deadband or available != self._published_available:
+            return False
+        if attributes != self._published_attributes:
+            # Např. stáří starých dat se zapisuje při každé aktualizaci.
+            return False
+        if value is None or self._published_value is None:
+            return False
+        if time.monotonic() - self._published_at >= self.max_publish_interval:
+            return False
+        return round(abs(value - self._published_value), 3) <= self.deadband
+
 
 class TemperatureSensor(SensorBase):
     """
@@ -132,12 +230,23 @@ class TemperatureSensor(SensorBase):
     Zobrazuje teplotní hodnoty v Home Assistant s příslušnou jednotkou a ikonou.
     """
     device_class = SensorDeviceClass.TEMPERATURE
-
-    def __init__(self, coordinator, device_type, name, icon=None):
+    deadband = TEMPERATURE_DEADBAND
+
+    def __init__(
+        self,
+        coordinator,
+        device_type,
+        name,
+        icon=None,
+        deadband=None,
+        max_publish_interval=None,
+    ):
         """Inicializuje teplotní senzorovou entitu."""
-        super().__init__(coordinator, device_type)
+        super().__init__(coordinator, device_type, deadband, max_publish_interval)
 
         self._id = name.replace(" ", "_").casefold()
+        self.coordinator_context = listener_context(device_type, self._id)
+        self._value = self._device.accessor(self._id)
         self._attr_name = name
         self._attr_unique_id = self._device.id + "_" + self._id
         self.entity_id = "sensor." + self._device.id + "_" + self._id
@@ -148,7 +257,7 @@ class TemperatureSensor(SensorBase):
     @property
     def state(self):
         """Vrací aktuální nastavenou teplotu."""
-        return self._device.get_state(self._id)
+        return self._value()
 
     @property
     def icon(self):
@@ -168,6 +277,8 @@ class GeneralSensor(SensorBase):
         super().__init__(coordinator, device_type)
 
         self._id = name.replace(" ", "_").casefold()
+        self.coordinator_context = listener_context(device_type, self._id)
+        self._value = self._device.accessor(self._id)
         self._attr_name = name
         self._attr_unique_id = self._device.id + "_" + self._id
         self.entity_id = "sensor." + self._device.id + "_" + self._id
@@ -178,9 +289,56 @@ class GeneralSensor(SensorBase):
     @property
     def state(self):
         """Vrací aktuální nastavenou hodnotu."""
-        return self._device.get_state(self._id)
+        return self._value()
+
+    @property
+    def icon(self):
+        """Vrací ikonu entity."""
+        return self._icon
+
+class PollingIntervalSensor(SensorBase):
+    """
+    Diagnostický senzor aktuálního intervalu dotazování čerpadla.
+
+    Stavem je interval v sekundách, atribut "duvod" uvádí, proč byl zvolen.
+    """
+
+    device_class = SensorDeviceClass.DURATION
+    entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator, device_type):
+        """Inicializuje senzor intervalu dotazování."""
+        super().__init__(coordinator, device_type)
+
+        self._id = POLL_INTERVAL_KEY
+        self.coordinator_context = listener_context(device_type, self._id)
+        self._attr_name = "Interval dotazovani"
+        self._attr_unique_id = self._device.id + "_" + self._id
+        self.entity_id = "sensor." + self._device.id + "_" + self._id
+
+        self._attr_native_unit_of_measurement = UnitOfTime.SECONDS
+
+    @property
+    def available(self) -> bool:
+        """Interval je známý i při nedostupném čerpadle."""
+        return True
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Zapíše nový interval dotazování."""
+        self.async_write_ha_state()
+
+    @property
+    def state(self):
+        """Vrací aktuální interval dotazování v sekundách."""
+        return round(self.coordinator.polling.interval)
+
+    @property
+    def extra_state_attributes(self):
+        """Vrací důvod aktuálního intervalu."""
+        return {"duvod": self.coordinator.polling.reason}
 
     @property
     def icon(self):
         """Vrací ikonu entity."""
-        return self._icon
\ No newline at end of file
+        return "mdi:timer-sync-outline"
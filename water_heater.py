@@ -1,3 +1,5 @@
+from typing import NamedTuple
+
 from homeassistant.const import (
     UnitOfTemperature,
     ATTR_TEMPERATURE,
@@ -16,6 +18,7 @@ from homeassistant.core import (
     callback,
 )
 
+from .coordinator import listener_context, stale_attributes
 from .const import (
     DOMAIN,
     DATA,
@@ -47,6 +50,66 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
         async_add_entities(new_entities)
 
 
+# Pole společného snímku, ze kterých se počítají odvozené hodnoty entity,
+# v pořadí argumentů derive_values.
+DERIVED_FIELDS = (
+    (REGULATOR, "rezim_zima_leto"),
+    (MONITOR, "rychle_nastaveni_topne_vody"),
+    (MONITOR, "zadana_teplota_topne_vody"),
+    (MONITOR, "topna_voda_bod_a"),
+    (MONITOR, "topna_voda_bod_b"),
+)
+
+
+class DerivedValues(NamedTuple):
+    """Hodnoty entity odvozené z jednoho snímku čerpadla."""
+
+    operation: str | None
+    target: float | None
+    min_temp: float
+    max_temp: float
+
+
+def derive_values(rezim, rychle, zadana, bod_a, bod_b) -> DerivedValues:
+    """
+    Určí režim operace, cílovou teplotu a rozsah nastavení teploty.
+
+    Args:
+        rezim: Režim zima/léto regulátoru (0 AUT, 1 zima, 2 léto).
+        rychle: Rychlé (manuální) nastavení teploty topné vody.
+        zadana: Zadaná teplota topné vody.
+        bod_a: Teplota topné vody v bodě A ekvitermní křivky.
+        bod_b: Teplota topné vody v bodě B ekvitermní křivky.
+
+    Returns:
+        DerivedValues: Odvozené hodnoty, režim None pro neznámý režim.
+    """
+    if rezim == 0:
+        operation = "AUT"
+    elif rezim == 1 and rychle == 0:
+        operation = "Zima"
+    elif rezim == 2:
+        operation = "Leto"
+    elif rezim == 1 and rychle is not None and rychle > 0:
+        operation = "MAN"
+    else:
+        operation = None
+
+    if operation == "MAN":
+        target = rychle
+    elif not zadana:
+        target = None
+    else:
+        target = zadana
+
+    return DerivedValues(
+        operation,
+        target,
+        30 if bod_a is None else bod_a - 5,
+        50 if bod_b is None else bod_b + 5,
+    )
+
+
 class WaterHeatPump(CoordinatorEntity, WaterHeaterEntity):
     """
     Reprezentace entity vodního tepelného čerpadla v Home Assistant.
@@ -60,9 +123,26 @@ class WaterHeatPump(CoordinatorEntity, WaterHeaterEntity):
         """
         super().__init__(coordinator)
         self._regulator = self.coordinator.hp.devices[REGULATOR]
-        self._monitor = self.coordinator.hp.devices[MONITOR]
 
         self._id = name.replace(" ", "_").casefold()
+        # Entita je informována jen o změně klíčů, ze kterých počítá svůj stav.
+        self.coordinator_context = listener_context(
+            REGULATOR, "rezim_zima_leto"
+        ) | listener_context(
+            MONITOR,
+            "rychle_nastaveni_topne_vody",
+            "zadana_teplota_topne_vody",
+            "teplota_topne_vody",
+            "topna_voda_bod_a",
+            "topna_voda_bod_b",
+        )
+        self._current_temperature = self.coordinator.hp.devices[MONITOR].accessor(
+            "teplota_topne_vody"
+        )
+        # Odvozené hodnoty a verze snímku a vstupy, ze kterých byly spočteny.
+        self._derived_version = None
+        self._derived_inputs = None
+        self._derived_values = None
         self._attr_name = name
         self._attr_unique_id = self._regulator.id + "_" + self._id
         self.entity_id = "water_heater." + self._regulator.id + "_" + self._id
@@ -94,13 +174,21 @@ class WaterHeatPump(CoordinatorEntity, WaterHeaterEntity):
         """
         return self._regulator.get_availability()
 
+    @property
+    def extra_state_attributes(self):
+        """
+        Vrací stáří zobrazených dat, pokud se je nepodařilo obnovit.
+
+        Stav entity se počítá z dat monitoru i regulátoru, uvádí se starší z nich.
+        """
+        return stale_attributes(self.coordinator.hp, REGULATOR, MONITOR)
+
     @callback
     def _handle_coordinator_update(self) -> None:
         """
         Zpracovává aktualizaci dat z koordinátora a obnovuje stav entity.
         """
         self._regulator = self.coordinator.hp.devices[REGULATOR]
-        self._monitor = self.coordinator.hp.devices[MONITOR]
         self.async_write_ha_state()
 
     @property
@@ -115,47 +203,44 @@ class WaterHeatPump(CoordinatorEntity, WaterHeaterEntity):
         """
         Určuje aktuální stav režimu operace tepelného čerpadla.
         """
-        res = self._regulator.get_state("rezim_zima_leto")
-        if res == 0:
-            if self._attr_current_operation is None:
-                self._attr_current_operation = "AUT"
-            return "AUT"
-        elif res == 1 and self._monitor.get_state("rychle_nastaveni_topne_vody") == 0:
-            if self._attr_current_operation is None:
-                self._attr_current_operation = "Zima"
-            return "Zima"
-        elif res == 2:
-            if self._attr_current_operation is None:
-                self._attr_current_operation = "Leto"
-            return "Leto"
-        elif res == 1 and self._monitor.get_state("rychle_nastaveni_topne_vody") > 0:
-            if self._attr_current_operation is None:
-                self._attr_current_operation = "MAN"
-            return "MAN"
-        else:
-            return None
+        mode = self._derived().operation
+        if mode is not None and self._attr_current_operation is None:
+            self._attr_current_operation = mode
+        return mode
+
+    def _derived(self) -> DerivedValues:
+        """
+        Vrátí odvozené hodnoty entity pro aktuální společný snímek čerpadla.
+
+        Hodnoty se počítají nejvýše jednou pro každou verzi snímku a znovu
+        jen tehdy, když se změnila některá z polí DERIVED_FIELDS.
+        """
+        snapshot = self.coordinator.hp.snapshot
+        if snapshot.version == self._derived_version:
+            return self._derived_values
+
+        self._derived_version = snapshot.version
+        inputs = tuple(
+            snapshot.get(device_id, key) for device_id, key in DERIVED_FIELDS
+        )
+        if inputs != self._derived_inputs:
+            self._derived_inputs = inputs
+            self._derived_values = derive_values(*inputs)
+        return self._derived_values
 
     @property
     def current_temperature(self):
         """
         Vrací aktuální teplotu topné vody.
         """
-        return self._monitor.get_state("teplota_topne_vody")
+        return self._current_temperature()
 
     @property
     def target_temperature(self):
         """
         Vrací cílovou teplotu topné vody na základě aktuálního režimu a nastavení.
         """
-        target_rychle = self._monitor.get_state("rychle_nastaveni_topne_vody")
-        target_zadana = self._monitor.get_state("zadana_teplota_topne_vody")
-
-        if target_rychle > 0 and self.state == "MAN":
-            return target_rychle
-        elif target_zadana == 0:
-            return None
-        else:
-            return target_zadana
+        return self._derived().target
 
     @property
     def target_temperature_high(self) -> float | None:
@@ -182,42 +267,36 @@ class WaterHeatPump(CoordinatorEntity, WaterHeaterEntity):
         """
         Vrací minimální možnou teplotu nastavení pro tepelné čerpadlo.
         """
-        a_temp = self._monitor.get_state("topna_voda_bod_a")
-        if a_temp is None:
-            return 30
-        return a_temp - 5
+        return self._derived().min_temp
 
     @property
     def max_temp(self):
         """
         Vrací maximální možnou teplotu nastavení pro tepelné čerpadlo.
         """
-        b_temp = self._monitor.get_state("topna_voda_bod_b")
-        if b_temp is None:
-            return 50
-        return b_temp + 5
+        return self._derived().max_temp
 
     async def async_set_temperature(self, **kwargs):
         """
         Asynchronně nastavuje cílovou teplotu tepelného čerpadla.
-        """
-        if self.current_operation != "MAN":
-            _LOGGER.debug("%s : volani async_set_operation_mode", self.entity_id)
-            await self.async_set_operation_mode("MAN")
 
+        Pokud čerpadlo není v režimu MAN, přepne se do něj ve stejné transakci.
+        """
         _LOGGER.debug(
             "%s : async_set_temperature volano s teplotou: %s.",
             self.entity_id,
             kwargs.get(ATTR_TEMPERATURE),
         )
-
         key_temp = "(0,2,123,00.0,47.5)"
 
-        _LOGGER.debug("%s : volani Heat Pump async_upload_data", self.entity_id)
-        await self._regulator.async_upload_data(key_temp, kwargs.get(ATTR_TEMPERATURE))
+        values = {}
+        operation_mode = None
+        if self.current_operation != "MAN":
+            values = self._operation_mode_values("MAN")
+            operation_mode = "MAN"
+        values[key_temp] = kwargs.get(ATTR_TEMPERATURE)
 
-        _LOGGER.debug("%s : volani Coordinator async_set_updated_data", self.entity_id)
-        await self.coordinator.async_set_updated_data()
+        await self._async_write_transaction(values, operation_mode)
 
     async def async_set_operation_mode(self, operation_mode):
         """
@@ -229,46 +308,64 @@ class WaterHeatPump(CoordinatorEntity, WaterHeaterEntity):
             self.entity_id,
             operation_mode,
         )
+        values = self._operation_mode_values(operation_mode)
+        if values:
+            await self._async_write_transaction(values, operation_mode)
+
+    def _operation_mode_values(self, operation_mode) -> dict:
+        """
+        Vrátí hodnoty parametrů pro přepnutí do režimu operace.
+
+        Při odchodu z režimu MAN se navíc vypne manuální nastavení teploty.
+
+        Args:
+            operation_mode: Požadovaný režim operace (AUT, Zima, Leto, MAN).
+
+        Returns:
+            dict: Hodnoty parametrů podle klíče, prázdný pro neznámý režim.
+        """
         key_mode = "(0,3,50,0,2)"
+        key_temp = "(0,2,123,00.0,47.5)"
+
+        values = {}
+        leaving_man = self.current_operation == "MAN"
+        if leaving_man and operation_mode in ("AUT", "Zima", "Leto"):
+            # Vypnutí manuálního režimu nastavení teploty.
+            values[key_temp] = 0
 
         if operation_mode == "AUT":
-            if self.current_operation == "MAN":
-                await self._async_unset_mode_man()
-            _LOGGER.debug("%s : volani Heat Pump async_upload_data", self.entity_id)
-            await self._regulator.async_upload_data(key_mode, 0)
-            self._attr_current_operation = "AUT"
+            values[key_mode] = 0
         elif operation_mode == "Zima":
-            if self.current_operation == "MAN":
-                await self._async_unset_mode_man()
-            _LOGGER.debug("%s : volani Heat Pump async_upload_data", self.entity_id)
-            await self._regulator.async_upload_data(key_mode, 1)
-            self._attr_current_operation = "Zima"
+            values[key_mode] = 1
         elif operation_mode == "Leto":
-            if self.current_operation == "MAN":
-                await self._async_unset_mode_man()
-            _LOGGER.debug("%s : volani Heat Pump async_upload_data", self.entity_id)
-            await self._regulator.async_upload_data(key_mode, 2)
-            self._attr_current_operation = "Leto"
+            values[key_mode] = 2
         elif operation_mode == "MAN":
-            _LOGGER.debug("%s : volani Heat Pump async_upload_data", self.entity_id)
-            await self._regulator.async_upload_data(key_mode, 1)
-            self._attr_current_operation = "MAN"
-            _LOGGER.debug("%s : volani async_set_temperature", self.entity_id)
-            await self.async_set_temperature(
-                **{ATTR_TEMPERATURE: self.target_temperature}
-            )
+            values[key_mode] = 1
+            values[key_temp] = self.target_temperature
+        return values
+
+    async def _async_write_transaction(self, values: dict, operation_mode=None):
+        """
+        Zapíše hodnoty parametrů jako jednu transakci.
+
+        Všechny parametry se odešlou v jedné dávce zápisů v daném pořadí
+        a následuje jediná aktualizace dat.
+        Po úspěšném zápisu se nastaví nový režim operace entity.
+
+        Args:
+            values: Hodnoty parametrů podle klíče.
+            operation_mode: Nový režim operace, None pokud se režim nemění.
+        """
+        _LOGGER.debug("%s : volani Coordinator async_write_values", self.entity_id)
+        await self.coordinator.async_write_values(values)
+
+        if operation_mode is None:
+            return
+        if operation_mode == "MAN":
             self._attr_supported_features = (
                 WaterHeaterEntityFeature.TARGET_TEMPERATURE
                 | WaterHeaterEntityFeature.OPERATION_MODE
             )
-
-        _LOGGER.debug("%s : volani Coordinator async_set_updated_data", self.entity_id)
-        await self.coordinator.async_set_updated_data()
-
-    async def _async_unset_mode_man(self):
-        """
-        Pomocná metoda pro vypnutí manuálního režimu nastavení teploty.
-        """
-        self._attr_supported_features = WaterHeaterEntityFeature.OPERATION_MODE
-        _LOGGER.debug("%s : volani async_set_temperature", self.entity_id)
-        await self.async_set_temperature(**{ATTR_TEMPERATURE: 0})
+        elif self.current_operation == "MAN":
+            self._attr_supported_features = WaterHeaterEntityFeature.OPERATION_MODE
+        self._attr_current_operation = operation_mode